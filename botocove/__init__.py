@@ -1,5 +1,28 @@
+from botocove.cove_abort import CoveAbortPolicy
+from botocove.cove_async import CoveAsyncSession, cove_async
+from botocove.cove_batch import cove_batch
+from botocove.cove_context import CoveContext
+from botocove.cove_credentials import CoveCredentialCache
 from botocove.cove_decorator import cove
+from botocove.cove_durations import CoveDurationStats
+from botocove.cove_org_cache import CoveOrgCache
+from botocove.cove_rate_limiter import CoveRateLimiter
+from botocove.cove_retry import CoveRetryPolicy
 from botocove.cove_session import CoveSession
 from botocove.cove_types import CoveOutput
 
-__all__ = ["cove", "CoveSession", "CoveOutput"]
+__all__ = [
+    "cove",
+    "cove_async",
+    "cove_batch",
+    "CoveSession",
+    "CoveAsyncSession",
+    "CoveOutput",
+    "CoveCredentialCache",
+    "CoveOrgCache",
+    "CoveContext",
+    "CoveRateLimiter",
+    "CoveRetryPolicy",
+    "CoveAbortPolicy",
+    "CoveDurationStats",
+]
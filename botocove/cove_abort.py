@@ -0,0 +1,85 @@
+from typing import Optional
+
+from botocove.cove_types import CoveSessionInformation
+
+
+class CoveAbortPolicy(object):
+    """When to give up on a run whose sessions are failing, rather than trying
+    every remaining account only to collect the same exception from each.
+
+    error_rate aborts once at least min_samples sessions have finished and that
+    fraction of them or more have failed. consecutive aborts once that many
+    sessions in a row have failed with the same type of exception. Either or
+    both may be set."""
+
+    def __init__(
+        self,
+        error_rate: Optional[float] = None,
+        min_samples: int = 20,
+        consecutive: Optional[int] = None,
+    ) -> None:
+        if error_rate is None and consecutive is None:
+            raise ValueError("CoveAbortPolicy needs error_rate, consecutive or both.")
+        if error_rate is not None and (
+            not isinstance(error_rate, (int, float)) or not 0 < error_rate <= 1
+        ):
+            raise ValueError(
+                f"error_rate must be a number greater than 0 and at most 1. "
+                f"Got {repr(error_rate)}."
+            )
+        for name, value in [("min_samples", min_samples), ("consecutive", consecutive)]:
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive int. Got {repr(value)}.")
+
+        self.error_rate = error_rate
+        self.min_samples = min_samples
+        self.consecutive = consecutive
+
+
+class CoveCircuitBreaker(object):
+    """Applies a CoveAbortPolicy to one run's finished sessions. Only the runner
+    calls observe(), so it needs no lock."""
+
+    def __init__(self, policy: CoveAbortPolicy) -> None:
+        self.policy = policy
+        self._finished = 0
+        self._failed = 0
+        self._streak = 0
+        self._streak_type: Optional[type] = None
+
+    def observe(self, record: CoveSessionInformation) -> Optional[str]:
+        """Returns why the run should abort, or None to carry on."""
+
+        self._finished += 1
+        error = record["ExceptionDetails"]
+        if error is None:
+            self._streak = 0
+            self._streak_type = None
+            return None
+
+        self._failed += 1
+        if type(error) is self._streak_type:
+            self._streak += 1
+        else:
+            self._streak = 1
+            self._streak_type = type(error)
+
+        if self.policy.consecutive is not None and (
+            self._streak >= self.policy.consecutive
+        ):
+            return (
+                f"{self._streak} sessions in a row failed with "
+                f"{type(error).__name__}: {error}"
+            )
+        if (
+            self.policy.error_rate is not None
+            and self._finished >= self.policy.min_samples
+            and self._failed / self._finished >= self.policy.error_rate
+        ):
+            return (
+                f"{self._failed} of {self._finished} sessions failed, reaching the "
+                f"error_rate of {self.policy.error_rate:.0%}"
+            )
+        return None
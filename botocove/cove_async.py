@@ -0,0 +1,314 @@
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from boto3.session import Session
+from botocore.exceptions import ClientError
+from botocore.loaders import Loader
+from mypy_boto3_sts.type_defs import PolicyDescriptorTypeTypeDef
+from tqdm import tqdm
+
+from botocove.cove_decorator import (
+    _typecheck_external_id,
+    _typecheck_ignore_ids,
+    _typecheck_regions,
+    _typecheck_target_ids,
+)
+from botocove.cove_host_account import CoveHostAccount
+from botocove.cove_runner import format_cove_output
+from botocove.cove_session import build_assume_role_args, create_shared_loader
+from botocove.cove_types import CoveFunctionOutput, CoveOutput, CoveSessionInformation
+
+logger = logging.getLogger(__name__)
+
+MISSING_AIOBOTOCORE_MESSAGE = (
+    "cove_async requires aiobotocore. Install it with `pip install botocove[async]`."
+)
+
+
+def cove_async(
+    _func: Optional[Callable[..., Awaitable[Any]]] = None,
+    *,
+    target_ids: Optional[List[str]] = None,
+    ignore_ids: Optional[List[str]] = None,
+    rolename: Optional[str] = None,
+    role_session_name: Optional[str] = None,
+    policy: Optional[str] = None,
+    policy_arns: Optional[List[PolicyDescriptorTypeTypeDef]] = None,
+    external_id: Optional[str] = None,
+    assuming_session: Optional[Session] = None,
+    raise_exception: bool = False,
+    max_concurrency: int = 100,
+    regions: Optional[List[str]] = None,
+    partition: Optional[str] = None,
+) -> Callable:  # type: ignore
+    """The asyncio counterpart of cove for `async def` functions. Role assumption
+    and the wrapped function run as coroutines on the caller's event loop, at most
+    max_concurrency at a time, and the decorated function must be awaited. It
+    returns the same output as cove."""
+
+    def decorator(
+        func: Callable[..., Awaitable[Any]],
+    ) -> Callable[..., Awaitable[CoveOutput]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> CoveOutput:
+
+            _typecheck_regions(regions)
+            _typecheck_external_id(external_id)
+            _typecheck_target_ids(target_ids)
+            _typecheck_ignore_ids(ignore_ids)
+            _typecheck_max_concurrency(max_concurrency)
+            _check_aiobotocore_installed()
+
+            # Target discovery is a handful of paginated calls, so it reuses the
+            # threaded host account rather than blocking the event loop.
+            loop = asyncio.get_running_loop()
+            host_account = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    CoveHostAccount,
+                    target_ids=target_ids,
+                    ignore_ids=ignore_ids,
+                    rolename=rolename,
+                    role_session_name=role_session_name,
+                    policy=policy,
+                    policy_arns=policy_arns,
+                    external_id=external_id,
+                    assuming_session=assuming_session,
+                    thread_workers=max_concurrency,
+                    regions=regions,
+                    partition=partition,
+                ),
+            )
+
+            runner = CoveAsyncRunner(
+                host_account=host_account,
+                func=func,
+                raise_exception=raise_exception,
+                func_args=args,
+                func_kwargs=kwargs,
+                max_concurrency=max_concurrency,
+                assuming_session=assuming_session or Session(),
+            )
+
+            output = await runner.run_cove_function()
+
+            return format_cove_output(output)
+
+        return wrapper
+
+    # Handle both bare decorator and with argument
+    if _func is None:
+        return decorator
+    else:
+        return decorator(_func)
+
+
+class CoveAsyncSession(object):
+    """Provides an assumed role's credentials to an async function. Clients are
+    aiobotocore clients and must be used as async context managers:
+
+        async with session.create_client("ec2") as ec2:
+            await ec2.describe_vpcs()
+    """
+
+    session_information: CoveSessionInformation
+
+    def __init__(
+        self,
+        session_info: CoveSessionInformation,
+        credentials: Dict[str, Any],
+        loader: Optional[Loader] = None,
+    ) -> None:
+        self.session_information = session_info
+        self.credentials = credentials
+        self.loader = loader
+        self._session: Any = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(account_id={self.session_information['Id']})"
+
+    @property
+    def region_name(self) -> Optional[str]:
+        return self.session_information["Region"]
+
+    def create_client(self, service_name: str, **kwargs: Any) -> Any:
+        if self._session is None:
+            self._session = _create_aio_session(self.loader)
+
+        kwargs.setdefault("region_name", self.region_name)
+        kwargs.setdefault("aws_access_key_id", self.credentials["AccessKeyId"])
+        kwargs.setdefault("aws_secret_access_key", self.credentials["SecretAccessKey"])
+        kwargs.setdefault("aws_session_token", self.credentials["SessionToken"])
+        return self._session.create_client(service_name, **kwargs)
+
+    def format_cove_result(self, result: Any) -> CoveSessionInformation:
+        self.session_information["Result"] = result
+        return self.session_information
+
+    def format_cove_error(self, err: Exception) -> CoveSessionInformation:
+        self.session_information["ExceptionDetails"] = err
+        return self.session_information
+
+
+class CoveAsyncRunner(object):
+    def __init__(
+        self,
+        host_account: CoveHostAccount,
+        func: Callable[..., Awaitable[Any]],
+        raise_exception: bool,
+        func_args: Any,
+        func_kwargs: Any,
+        max_concurrency: int,
+        assuming_session: Session,
+    ) -> None:
+
+        self.host_account = host_account
+
+        self.cove_wrapped_func = func
+        self.raise_exception = raise_exception
+        self.func_args = func_args
+        self.func_kwargs = func_kwargs
+
+        self.max_concurrency = max_concurrency
+        self.assuming_session = assuming_session
+        self.loader = create_shared_loader()
+
+        # Each account's role is assumed once per run, as in CoveRunner, and
+        # a failure is shared with the account's other regions.
+        self._credentials: Dict[str, Dict[str, Any]] = {}
+        self._failures: Dict[str, Exception] = {}
+        self._role_locks: Dict[str, asyncio.Lock] = {}
+
+    async def run_cove_function(self) -> CoveFunctionOutput:
+        from aiobotocore.config import AioConfig
+
+        # Frozen once per run: aiobotocore can't refresh boto3's credentials.
+        host_credentials = self.assuming_session.get_credentials()
+        if host_credentials is None:
+            raise ValueError("The assuming session has no credentials to use")
+        frozen = host_credentials.get_frozen_credentials()
+
+        completed: List[CoveSessionInformation] = []
+        pending_sessions = self.host_account.iter_cove_sessions()
+        progress = tqdm(
+            total=self.host_account.session_count,
+            desc="Executing function",
+            colour="#ff69b4",  # hotpink
+        )
+
+        async with _create_aio_session(self.loader).create_client(
+            "sts",
+            region_name=self.assuming_session.region_name,
+            aws_access_key_id=frozen.access_key,
+            aws_secret_access_key=frozen.secret_key,
+            aws_session_token=frozen.token,
+            config=AioConfig(max_pool_connections=self.max_concurrency),
+        ) as sts_client:
+            # A fixed pool of workers pulls from one iterator, so only
+            # max_concurrency coroutines exist however many sessions there are.
+            workers = [
+                asyncio.ensure_future(
+                    self._cove_worker(sts_client, pending_sessions, completed, progress)
+                )
+                for _ in range(
+                    min(self.max_concurrency, self.host_account.session_count)
+                )
+            ]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                progress.close()
+
+        return CoveFunctionOutput(
+            Results=[r for r in completed if not r["ExceptionDetails"]],
+            Exceptions=[r for r in completed if r["ExceptionDetails"]],
+        )
+
+    async def _cove_worker(
+        self,
+        sts_client: Any,
+        pending_sessions: Iterator[CoveSessionInformation],
+        completed: List[CoveSessionInformation],
+        progress: "tqdm[Any]",
+    ) -> None:
+        for account_session_info in pending_sessions:
+            completed.append(await self.cove_task(sts_client, account_session_info))
+            progress.update()
+
+    async def cove_task(
+        self,
+        sts_client: Any,
+        account_session_info: CoveSessionInformation,
+    ) -> CoveSessionInformation:
+        cove_session: Optional[CoveAsyncSession] = None
+        try:
+            credentials = await self._assume_role(sts_client, account_session_info)
+            account_session_info["AssumeRoleSuccess"] = True
+            cove_session = CoveAsyncSession(
+                account_session_info, credentials, loader=self.loader
+            )
+
+            result = await self.cove_wrapped_func(
+                cove_session, *self.func_args, **self.func_kwargs
+            )
+
+            return cove_session.format_cove_result(result)
+
+        except Exception as e:
+            account_session_info["ExceptionDetails"] = e
+            if self.raise_exception is True:
+                logger.exception(account_session_info)
+                raise
+            else:
+                return account_session_info
+
+    async def _assume_role(
+        self, sts_client: Any, account_session_info: CoveSessionInformation
+    ) -> Dict[str, Any]:
+        assume_role_args = build_assume_role_args(account_session_info)
+        role_arn = assume_role_args["RoleArn"]
+
+        lock = self._role_locks.setdefault(role_arn, asyncio.Lock())
+        async with lock:
+            if role_arn in self._failures:
+                raise self._failures[role_arn]
+            if role_arn not in self._credentials:
+                logger.debug(f"Attempting to assume {role_arn}")
+                try:
+                    response = await sts_client.assume_role(**assume_role_args)
+                except ClientError as e:
+                    logger.error(
+                        f"Failed to initalize cove session for "
+                        f"account {account_session_info['Id']}"
+                    )
+                    self._failures[role_arn] = e
+                    raise
+                self._credentials[role_arn] = response["Credentials"]
+            return self._credentials[role_arn]
+
+
+def _create_aio_session(loader: Optional[Loader]) -> Any:
+    from aiobotocore.session import get_session
+
+    session = get_session()
+    if loader is not None:
+        session.register_component("data_loader", loader)
+    return session
+
+
+def _check_aiobotocore_installed() -> None:
+    try:
+        import aiobotocore  # noqa: F401
+    except ImportError as e:
+        raise ImportError(MISSING_AIOBOTOCORE_MESSAGE) from e
+
+
+def _typecheck_max_concurrency(max_concurrency: int) -> None:
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise ValueError(
+            f"max_concurrency must be a positive int. Got {repr(max_concurrency)}."
+        )
@@ -0,0 +1,105 @@
+import functools
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from botocove.cove_decorator import cove
+from botocove.cove_session import CoveSession
+from botocove.cove_types import CoveOutput
+
+# A function's result and the exception it raised, one of them None
+BatchOutcome = Tuple[Any, Optional[Exception]]
+
+# Arguments whose output cove_batch can't split between its functions
+UNSUPPORTED_ARGUMENTS = ["stream", "reducer", "journal"]
+
+
+def cove_batch(
+    functions: Sequence[Callable[..., Any]], **cove_kwargs: Any
+) -> Callable[..., Dict[str, CoveOutput]]:
+    """Runs several functions in one pass over the organization. Targets are
+    resolved and each role is assumed once, then every function runs in turn in
+    the same CoveSession. Takes the same keyword arguments as cove, except
+    stream, reducer, journal and executor="process". The returned callable
+    passes its arguments to every function and returns each one's CoveOutput,
+    keyed by its name.
+
+    A function's exception is reported in its own output without stopping the
+    others, so retry and abort_on only see failures common to every function,
+    such as failing to assume the role."""
+
+    names = _typecheck_functions(functions)
+    for argument in UNSUPPORTED_ARGUMENTS:
+        if cove_kwargs.get(argument):
+            raise ValueError(f"{argument} can't be used with cove_batch.")
+    if cove_kwargs.get("executor") == "process":
+        raise ValueError('executor="process" can\'t be used with cove_batch.')
+    raise_exception = cove_kwargs.get("raise_exception", False)
+
+    def run_batch(
+        session: CoveSession, *args: Any, **kwargs: Any
+    ) -> Dict[str, BatchOutcome]:
+        outcomes: Dict[str, BatchOutcome] = {}
+        for name, func in zip(names, functions):
+            try:
+                outcomes[name] = (func(session, *args, **kwargs), None)
+            except Exception as e:
+                if raise_exception is True:
+                    raise
+                outcomes[name] = (None, e)
+        return outcomes
+
+    # Names the batch for anything keyed on the function, like duration_stats
+    run_batch.__qualname__ = f"cove_batch[{','.join(names)}]"
+
+    @functools.wraps(run_batch)
+    def wrapper(*args: Any, **kwargs: Any) -> Dict[str, CoveOutput]:
+        output = cove(run_batch, **cove_kwargs)(*args, **kwargs)
+        return split_batch_output(names, output)
+
+    return wrapper
+
+
+def split_batch_output(names: List[str], output: CoveOutput) -> Dict[str, CoveOutput]:
+    """Gives each function its own output. Failures before any function ran,
+    such as failing to assume the role, are reported in every function's."""
+
+    split: Dict[str, CoveOutput] = {}
+    for name in names:
+        function_output = CoveOutput(
+            Results=[],
+            Exceptions=[dict(e) for e in output["Exceptions"]],
+            FailedAssumeRole=[dict(f) for f in output["FailedAssumeRole"]],
+        )
+        for record in output["Results"]:
+            result, error = record["Result"][name]
+            function_record = {k: v for k, v in record.items() if k != "Result"}
+            if error is not None:
+                function_record["ExceptionDetails"] = error
+                function_output["Exceptions"].append(function_record)
+            else:
+                if result is not None:
+                    function_record["Result"] = result
+                function_output["Results"].append(function_record)
+        if "Concurrency" in output:
+            function_output["Concurrency"] = output["Concurrency"]
+        if "AbortReason" in output:
+            function_output["AbortReason"] = output["AbortReason"]
+        split[name] = function_output
+    return split
+
+
+def _typecheck_functions(functions: Sequence[Callable[..., Any]]) -> List[str]:
+    if isinstance(functions, str) or not isinstance(functions, (list, tuple)):
+        raise TypeError(
+            f"functions must be a list of callables. Got {repr(functions)}."
+        )
+    if len(functions) == 0:
+        raise ValueError("functions must have at least 1 element. Got [].")
+
+    names = []
+    for func in functions:
+        if not callable(func):
+            raise TypeError(f"functions must be callable. Got {repr(func)}.")
+        names.append(getattr(func, "__name__", type(func).__name__))
+    if len(set(names)) != len(names):
+        raise ValueError(f"functions must have distinct names. Got {names}.")
+    return names
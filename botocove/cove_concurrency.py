@@ -0,0 +1,70 @@
+import math
+import threading
+
+from botocove.cove_types import CoveConcurrencyStats
+
+# Halve the limit when throttled or when latency has doubled from its best
+DECREASE_FACTOR = 0.5
+LATENCY_TOLERANCE = 2.0
+LATENCY_SMOOTHING = 0.1
+
+
+class CoveConcurrencyController(object):
+    """Tunes how many sessions run at once with additive increase, multiplicative
+    decrease (AIMD). Each completed session adds 1/limit to the limit, so it
+    grows by one for every limit sessions that complete cleanly. A session that
+    saw throttling, or a smoothed latency more than LATENCY_TOLERANCE times the
+    best seen so far, cuts the limit by DECREASE_FACTOR. After a cut the limit
+    isn't cut again until as many sessions have completed as were in flight,
+    so one burst of throttling only counts once.
+
+    observe() is called from worker threads and limit is read by the runner."""
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.initial = max(minimum, min(initial, maximum))
+
+        self._limit = float(self.initial)
+        self._peak = self.initial
+        self._throttles = 0
+        self._latency: float = 0.0
+        self._best_latency = math.inf
+        self._completions_until_decrease = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def observe(self, latency: float, throttles: int) -> None:
+        with self._lock:
+            self._throttles += throttles
+            if self._latency:
+                self._latency += LATENCY_SMOOTHING * (latency - self._latency)
+            else:
+                self._latency = latency
+            self._best_latency = min(self._best_latency, self._latency)
+
+            self._completions_until_decrease -= 1
+            congested = (
+                throttles > 0 or self._latency > LATENCY_TOLERANCE * self._best_latency
+            )
+            if congested:
+                if self._completions_until_decrease <= 0:
+                    self._limit = max(self.minimum, self._limit * DECREASE_FACTOR)
+                    self._completions_until_decrease = self.limit
+                    # Latency is judged afresh at the new limit
+                    self._best_latency = self._latency
+            else:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                self._peak = max(self._peak, self.limit)
+
+    def stats(self) -> CoveConcurrencyStats:
+        with self._lock:
+            return CoveConcurrencyStats(
+                Initial=self.initial,
+                Final=self.limit,
+                Peak=self._peak,
+                Throttles=self._throttles,
+            )
@@ -0,0 +1,127 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Optional, Type
+
+from boto3.session import Session
+from botocore.config import Config
+from mypy_boto3_organizations.client import OrganizationsClient
+from mypy_boto3_sts.client import STSClient
+from mypy_boto3_sts.type_defs import GetCallerIdentityResponseTypeDef
+
+from botocove.cove_credentials import CoveCredentialCache
+from botocove.cove_org_cache import CoveOrgCache
+from botocove.cove_rate_limiter import CoveRateLimiter, RateLimit, as_rate_limiter
+from botocove.cove_session import create_shared_loader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREAD_WORKERS = 20
+
+
+class CoveContext(object):
+    """Keeps everything a cove call sets up before its first account runs, so it
+    can be reused by many calls in a long-running process: the worker threads,
+    the host account's STS and Organizations clients and their connection pools,
+    the caller's identity, the botocore data loader, assumed role credentials and
+    organization data.
+
+    Pass the same context to any number of decorated functions, from any number
+    of threads. Call close(), or use the context as a context manager, to stop
+    its worker threads."""
+
+    def __init__(
+        self,
+        assuming_session: Optional[Session] = None,
+        thread_workers: int = DEFAULT_THREAD_WORKERS,
+        credential_cache: Optional[CoveCredentialCache] = None,
+        org_cache: Optional[CoveOrgCache] = None,
+        org_rate: Optional[RateLimit] = None,
+    ) -> None:
+        if not isinstance(thread_workers, int) or thread_workers < 1:
+            raise ValueError(
+                f"thread_workers must be a positive int. Got {repr(thread_workers)}."
+            )
+
+        if assuming_session:
+            logger.info(f"Using provided Boto3 session {assuming_session}")
+        else:
+            logger.info("No Boto3 session argument: using credential chain")
+            assuming_session = Session()
+
+        self.assuming_session = assuming_session
+        self.thread_workers = thread_workers
+        self.credential_cache = (
+            credential_cache if credential_cache is not None else CoveCredentialCache()
+        )
+        self.org_cache = org_cache if org_cache is not None else CoveOrgCache()
+
+        self.sts_client = create_sts_client(assuming_session, thread_workers)
+        self.org_client = create_org_client(
+            assuming_session, thread_workers, as_rate_limiter(org_rate)
+        )
+        self.caller_identity: GetCallerIdentityResponseTypeDef = (
+            self.sts_client.get_caller_identity()
+        )
+        self.loader = create_shared_loader()
+        self.executor = ThreadPoolExecutor(
+            max_workers=thread_workers, thread_name_prefix="botocove"
+        )
+
+    def __enter__(self) -> "CoveContext":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.credential_cache.save()
+        self.org_cache.save()
+
+
+# Adaptive retries back off and rate limit the client when it is throttled,
+# so a burst of calls from many threads slows down instead of failing.
+
+
+def create_sts_client(assuming_session: Session, thread_workers: int) -> STSClient:
+    return assuming_session.client(
+        service_name="sts",
+        config=Config(
+            max_pool_connections=thread_workers,
+            retries={"mode": "adaptive"},
+        ),
+    )
+
+
+def create_account_client(assuming_session: Session, thread_workers: int) -> Any:
+    return assuming_session.client(
+        service_name="account",
+        config=Config(
+            max_pool_connections=thread_workers,
+            retries={"mode": "adaptive"},
+        ),
+    )
+
+
+def create_org_client(
+    assuming_session: Session,
+    thread_workers: int,
+    rate_limiter: Optional[CoveRateLimiter] = None,
+) -> OrganizationsClient:
+    org_client = assuming_session.client(
+        service_name="organizations",
+        config=Config(
+            max_pool_connections=thread_workers,
+            retries={"mode": "adaptive"},
+        ),
+    )
+    # Organizations allows few requests per second, shared by the whole account
+    if rate_limiter is not None:
+        rate_limiter.pace_client(org_client)
+    return org_client
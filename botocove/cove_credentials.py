@@ -0,0 +1,248 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+from mypy_boto3_sts.client import STSClient
+from mypy_boto3_sts.type_defs import CredentialsTypeDef
+
+from botocove.cove_files import write_private_json
+from botocove.cove_rate_limiter import CoveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+CredentialKey = Tuple[str, ...]
+
+DEFAULT_MAX_SIZE = 4096
+DEFAULT_REFRESH_SECONDS = 300
+
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+}
+
+
+class CoveCredentialCache(object):
+    """Assumes each distinct role once and hands the same credentials to every
+    CoveSession that asks for them until they are about to expire.
+
+    Credentials are keyed on the identity that assumed the role and on everything
+    passed to assume_role: the role ARN (partition, account and role name), role
+    session name, session policies and external id. Concurrent requests for the
+    same role wait on the first assume_role call rather than racing to make
+    their own.
+
+    Each cove call uses a cache of its own unless one is passed in, so pass the
+    same instance to several calls to share credentials between them.
+
+    The cache holds at most max_size credentials, evicting expired and then
+    least recently used entries first. If a path is given, unexpired credentials
+    are loaded from it on creation and merged back into it by save(). The file
+    holds live secrets and is written readable by the current user only."""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        refresh_seconds: int = DEFAULT_REFRESH_SECONDS,
+        path: Optional[str] = None,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1. Got {max_size}.")
+
+        self.max_size = max_size
+        self.refresh_window = timedelta(seconds=refresh_seconds)
+        self.path = path
+
+        self._credentials: "OrderedDict[CredentialKey, CredentialsTypeDef]" = (
+            OrderedDict()
+        )
+        self._key_locks: Dict[CredentialKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None:
+            for key, creds in _read_credentials_file(self.path):
+                self._store(key, creds)
+
+    def __len__(self) -> int:
+        return len(self._credentials)
+
+    def assume_role(
+        self,
+        sts_client: STSClient,
+        caller_arn: str,
+        failures: Optional[Dict[CredentialKey, Exception]] = None,
+        rate_limiter: Optional[CoveRateLimiter] = None,
+        **assume_role_args: Any,
+    ) -> CredentialsTypeDef:
+        """If a failures dict is given, a failed assume_role call is recorded in it
+        and re-raised to later callers for the same role without calling STS
+        again. The runner passes one per run so a missing role is only tried
+        once per account rather than once per region.
+
+        If a rate limiter is given, it paces the calls made to STS. Credentials
+        found in the cache don't wait on it."""
+
+        key = _credential_key(caller_arn, assume_role_args)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if failures is not None and key in failures:
+                raise failures[key]
+
+            cached = self._get(key)
+            if cached is not None:
+                logger.debug(f"Reusing credentials for {assume_role_args['RoleArn']}")
+                return cached
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            try:
+                creds = sts_client.assume_role(**assume_role_args)["Credentials"]
+            except Exception as e:
+                # Throttling says nothing about the role, so the account's other
+                # regions try again rather than failing with it.
+                if failures is not None and not _is_throttling_error(e):
+                    failures[key] = e
+                raise
+
+            with self._lock:
+                self._store(key, creds)
+            return creds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._credentials.clear()
+            self._key_locks.clear()
+
+    def save(self) -> None:
+        """Merges the unexpired credentials in memory with those already in the
+        cache file, so concurrent processes sharing the file don't drop each
+        other's entries."""
+
+        if self.path is None:
+            return
+
+        with self._lock:
+            merged = OrderedDict(_read_credentials_file(self.path))
+            merged.update(self._credentials)
+            entries = [
+                {"Key": list(key), "Credentials": _serialize_credentials(creds)}
+                for key, creds in merged.items()
+                if self._is_fresh(creds)
+            ]
+
+        overflow = len(entries) - self.max_size
+        if overflow > 0:
+            entries = entries[overflow:]
+
+        write_private_json(self.path, entries)
+
+    def _get(self, key: CredentialKey) -> Optional[CredentialsTypeDef]:
+        with self._lock:
+            creds = self._credentials.get(key)
+            if creds is None:
+                return None
+            if not self._is_fresh(creds):
+                del self._credentials[key]
+                return None
+            self._credentials.move_to_end(key)
+            return creds
+
+    def _store(self, key: CredentialKey, creds: CredentialsTypeDef) -> None:
+        """Callers must hold self._lock, except during __init__."""
+
+        self._credentials[key] = creds
+        self._credentials.move_to_end(key)
+
+        if len(self._credentials) <= self.max_size:
+            return
+
+        for stale_key in [
+            k for k, v in self._credentials.items() if not self._is_fresh(v)
+        ]:
+            self._evict(stale_key)
+
+        while len(self._credentials) > self.max_size:
+            oldest_key = next(iter(self._credentials))
+            self._evict(oldest_key)
+
+    def _evict(self, key: CredentialKey) -> None:
+        del self._credentials[key]
+        self._key_locks.pop(key, None)
+
+    def _is_fresh(self, creds: CredentialsTypeDef) -> bool:
+        expiration = creds["Expiration"]
+        if expiration.tzinfo is None:
+            expiration = expiration.replace(tzinfo=timezone.utc)
+        return expiration - datetime.now(timezone.utc) > self.refresh_window
+
+
+def _is_throttling_error(e: Exception) -> bool:
+    return (
+        isinstance(e, ClientError)
+        and e.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    )
+
+
+def _credential_key(caller_arn: str, assume_role_args: Dict[str, Any]) -> CredentialKey:
+    return (
+        caller_arn,
+        assume_role_args["RoleArn"],
+        assume_role_args.get("RoleSessionName") or "",
+        assume_role_args.get("Policy") or "",
+        json.dumps(assume_role_args.get("PolicyArns"), sort_keys=True),
+        assume_role_args.get("ExternalId") or "",
+    )
+
+
+def _serialize_credentials(creds: CredentialsTypeDef) -> Dict[str, str]:
+    return {
+        "AccessKeyId": creds["AccessKeyId"],
+        "SecretAccessKey": creds["SecretAccessKey"],
+        "SessionToken": creds["SessionToken"],
+        "Expiration": creds["Expiration"].isoformat(),
+    }
+
+
+def _read_credentials_file(
+    path: str,
+) -> List[Tuple[CredentialKey, CredentialsTypeDef]]:
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except ValueError:
+        logger.warning(f"Ignoring unreadable credential cache file {path}")
+        return []
+
+    if not isinstance(entries, list):
+        logger.warning(f"Ignoring unreadable credential cache file {path}")
+        return []
+
+    credentials: List[Tuple[CredentialKey, CredentialsTypeDef]] = []
+    for entry in entries:
+        try:
+            credentials.append(
+                (
+                    tuple(str(part) for part in entry["Key"]),
+                    CredentialsTypeDef(
+                        AccessKeyId=entry["Credentials"]["AccessKeyId"],
+                        SecretAccessKey=entry["Credentials"]["SecretAccessKey"],
+                        SessionToken=entry["Credentials"]["SessionToken"],
+                        Expiration=datetime.fromisoformat(
+                            entry["Credentials"]["Expiration"]
+                        ),
+                    ),
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed entry in credential cache file {path}")
+    return credentials
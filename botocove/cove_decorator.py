@@ -1,14 +1,23 @@
 import functools
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 from warnings import warn
 
 from boto3.session import Session
 from mypy_boto3_sts.type_defs import PolicyDescriptorTypeTypeDef
 
-from botocove.cove_host_account import CoveHostAccount
-from botocove.cove_runner import CoveRunner
-from botocove.cove_types import CoveOutput
+from botocove.cove_abort import CoveAbortPolicy
+from botocove.cove_context import CoveContext
+from botocove.cove_credentials import CoveCredentialCache
+from botocove.cove_durations import CoveDurationStats
+from botocove.cove_host_account import ENABLED_REGIONS, SCOPES, CoveHostAccount
+from botocove.cove_journal import CoveJournal
+from botocove.cove_org_cache import CoveOrgCache
+from botocove.cove_process import EXECUTORS
+from botocove.cove_rate_limiter import CoveRateLimiter, RateLimit, as_rate_limiter
+from botocove.cove_rerun import RERUN_SELECTIONS, RerunSource, select_work_items
+from botocove.cove_retry import CoveRetryPolicy
+from botocove.cove_runner import CoveRunner, format_cove_output, format_cove_record
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +35,38 @@ def cove(
     assuming_session: Optional[Session] = None,
     raise_exception: bool = False,
     thread_workers: int = 20,
-    regions: Optional[List[str]] = None,
+    regions: Optional[Union[List[str], str]] = None,
     partition: Optional[str] = None,
+    credential_cache: Optional[CoveCredentialCache] = None,
+    services: Optional[List[str]] = None,
+    stream: bool = False,
+    max_in_flight: Optional[int] = None,
+    reducer: Optional[Callable[[Any, Dict[str, Any]], Any]] = None,
+    reducer_initial: Any = None,
+    org_cache: Optional[CoveOrgCache] = None,
+    context: Optional[CoveContext] = None,
+    executor: str = "thread",
+    assume_role_workers: Optional[int] = None,
+    assume_role_rate: Optional[RateLimit] = None,
+    org_rate: Optional[RateLimit] = None,
+    adaptive_concurrency: bool = False,
+    task_timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    retry: Optional[CoveRetryPolicy] = None,
+    abort_on: Optional[CoveAbortPolicy] = None,
+    duration_stats: Optional[CoveDurationStats] = None,
+    journal: Optional[str] = None,
+    resume: bool = False,
+    rerun: Optional[RerunSource] = None,
+    rerun_select: str = "failed",
+    scope: str = "region",
     **cove_kwargs: Any,
 ) -> Callable:  # type: ignore
-    def decorator(func: Callable[..., Any]) -> Callable[..., CoveOutput]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @functools.wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> CoveOutput:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Returns a CoveOutput, an iterator of records when streaming, or the
+            # reducer's aggregate when given a reducer.
 
             _check_deprecation(cove_kwargs)
 
@@ -40,9 +74,45 @@ def cove(
             _typecheck_external_id(external_id)
             _typecheck_target_ids(target_ids)
             _typecheck_ignore_ids(ignore_ids)
+            _typecheck_services(services)
+            _typecheck_max_in_flight(max_in_flight)
+            _typecheck_reducer(reducer, stream)
+            _typecheck_executor(executor)
+            _typecheck_assume_role_workers(assume_role_workers)
+            _typecheck_rate("assume_role_rate", assume_role_rate)
+            _typecheck_rate("org_rate", org_rate)
+            _typecheck_seconds("task_timeout", task_timeout)
+            _typecheck_seconds("deadline", deadline)
+            _typecheck_retry(retry)
+            _typecheck_abort_on(abort_on)
+            _typecheck_duration_stats(duration_stats)
+            _typecheck_journal(journal, resume)
+            _typecheck_rerun(rerun, rerun_select, target_ids, regions)
+            _typecheck_scope(scope)
+            if adaptive_concurrency and max_in_flight is not None:
+                raise ValueError(
+                    "max_in_flight can't be used with adaptive_concurrency."
+                )
+            _check_context_arguments(
+                context, assuming_session, credential_cache, org_cache, org_rate
+            )
+            workers = context.thread_workers if context else thread_workers
+
+            run_target_ids = target_ids
+            run_regions: Optional[Union[Sequence[Optional[str]], str]] = regions
+            work_items = None
+            if rerun is not None:
+                work_items = select_work_items(rerun, rerun_select)
+                if not work_items:
+                    raise ValueError(
+                        f"There is nothing to rerun: the previous run has no "
+                        f"records selected by rerun_select={repr(rerun_select)}."
+                    )
+                run_target_ids = sorted({account_id for account_id, _ in work_items})
+                run_regions = sorted({region for _, region in work_items}, key=str)
 
             host_account = CoveHostAccount(
-                target_ids=target_ids,
+                target_ids=run_target_ids,
                 ignore_ids=ignore_ids,
                 rolename=rolename,
                 role_session_name=role_session_name,
@@ -50,9 +120,14 @@ def cove(
                 policy_arns=policy_arns,
                 external_id=external_id,
                 assuming_session=assuming_session,
-                thread_workers=thread_workers,
-                regions=regions,
+                thread_workers=workers,
+                regions=run_regions,
                 partition=partition,
+                org_cache=org_cache,
+                context=context,
+                org_rate_limiter=as_rate_limiter(org_rate),
+                work_items=work_items,
+                scope=scope,
             )
 
             runner = CoveRunner(
@@ -61,28 +136,36 @@ def cove(
                 raise_exception=raise_exception,
                 func_args=args,
                 func_kwargs=kwargs,
-                thread_workers=thread_workers,
+                thread_workers=workers,
+                credential_cache=credential_cache,
+                services=services,
+                max_in_flight=max_in_flight,
+                context=context,
+                executor=executor,
+                assume_role_workers=assume_role_workers,
+                assume_role_rate=assume_role_rate,
+                adaptive_concurrency=adaptive_concurrency,
+                task_timeout=task_timeout,
+                deadline=deadline,
+                retry=retry,
+                abort_on=abort_on,
+                duration_stats=duration_stats,
+                journal=CoveJournal(journal) if journal is not None else None,
+                resume=resume,
             )
 
+            if reducer is not None:
+                return runner.reduce_cove_function(reducer, reducer_initial)
+
+            if stream:
+                return (
+                    format_cove_record(record) for record in runner.iter_cove_function()
+                )
+
             output = runner.run_cove_function()
 
             # Rewrite dataclasses into untyped dicts to retain current functionality
-            return CoveOutput(
-                Results=[
-                    {k: v for k, v in r.items() if v is not None}
-                    for r in output["Results"]
-                ],
-                Exceptions=[
-                    {k: v for k, v in e.items() if v is not None}
-                    for e in output["Exceptions"]
-                    if e["AssumeRoleSuccess"] is True
-                ],
-                FailedAssumeRole=[
-                    {k: v for k, v in f.items() if v is not None}
-                    for f in output["Exceptions"]
-                    if f["AssumeRoleSuccess"] is False
-                ],
-            )
+            return format_cove_output(output)
 
         return wrapper
 
@@ -93,8 +176,8 @@ def cove(
         return decorator(_func)
 
 
-def _typecheck_regions(list_of_regions: Optional[List[str]]) -> None:
-    if list_of_regions is None:
+def _typecheck_regions(list_of_regions: Optional[Union[List[str], str]]) -> None:
+    if list_of_regions is None or list_of_regions == ENABLED_REGIONS:
         return
     if isinstance(list_of_regions, str):
         raise TypeError(
@@ -106,6 +189,155 @@ def _typecheck_regions(list_of_regions: Optional[List[str]]) -> None:
         )
 
 
+def _typecheck_services(services: Optional[List[str]]) -> None:
+    if services is None:
+        return
+    if isinstance(services, str):
+        raise TypeError(f"services must be a list of str. Got str {repr(services)}.")
+    for service in services:
+        if not isinstance(service, str):
+            raise TypeError(
+                f"{service} is an incorrect type: all services must be strings "
+                f"not {type(service)}"
+            )
+
+
+def _typecheck_max_in_flight(max_in_flight: Optional[int]) -> None:
+    if max_in_flight is None:
+        return
+    if not isinstance(max_in_flight, int) or max_in_flight < 1:
+        raise ValueError(
+            f"max_in_flight must be a positive int. Got {repr(max_in_flight)}."
+        )
+
+
+def _typecheck_reducer(
+    reducer: Optional[Callable[[Any, Dict[str, Any]], Any]], stream: bool
+) -> None:
+    if reducer is None:
+        return
+    if not callable(reducer):
+        raise TypeError(f"reducer must be callable. Got {repr(reducer)}.")
+    if stream:
+        raise ValueError("reducer and stream=True can't be used together.")
+
+
+def _typecheck_executor(executor: str) -> None:
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"executor must be one of {', '.join(EXECUTORS)}. Got {repr(executor)}."
+        )
+
+
+def _typecheck_assume_role_workers(assume_role_workers: Optional[int]) -> None:
+    if assume_role_workers is None:
+        return
+    if not isinstance(assume_role_workers, int) or assume_role_workers < 1:
+        raise ValueError(
+            "assume_role_workers must be a positive int. "
+            f"Got {repr(assume_role_workers)}."
+        )
+
+
+def _typecheck_rate(name: str, rate: Optional[RateLimit]) -> None:
+    if rate is None or isinstance(rate, CoveRateLimiter):
+        return
+    if not isinstance(rate, (int, float)) or rate <= 0:
+        raise ValueError(
+            f"{name} must be a positive number or a CoveRateLimiter. "
+            f"Got {repr(rate)}."
+        )
+
+
+def _typecheck_seconds(name: str, seconds: Optional[float]) -> None:
+    if seconds is None:
+        return
+    if (
+        isinstance(seconds, bool)
+        or not isinstance(seconds, (int, float))
+        or seconds <= 0
+    ):
+        raise ValueError(f"{name} must be a positive number. Got {repr(seconds)}.")
+
+
+def _typecheck_retry(retry: Optional[CoveRetryPolicy]) -> None:
+    if retry is not None and not isinstance(retry, CoveRetryPolicy):
+        raise TypeError(f"retry must be a CoveRetryPolicy. Got {repr(retry)}.")
+
+
+def _typecheck_abort_on(abort_on: Optional[CoveAbortPolicy]) -> None:
+    if abort_on is not None and not isinstance(abort_on, CoveAbortPolicy):
+        raise TypeError(f"abort_on must be a CoveAbortPolicy. Got {repr(abort_on)}.")
+
+
+def _typecheck_duration_stats(duration_stats: Optional[CoveDurationStats]) -> None:
+    if duration_stats is not None and not isinstance(duration_stats, CoveDurationStats):
+        raise TypeError(
+            f"duration_stats must be a CoveDurationStats. Got {repr(duration_stats)}."
+        )
+
+
+def _typecheck_journal(journal: Optional[str], resume: bool) -> None:
+    if journal is not None and not isinstance(journal, str):
+        raise TypeError(f"journal must be a str path. Got {repr(journal)}.")
+    if resume and journal is None:
+        raise ValueError("resume needs a journal to resume from.")
+
+
+def _typecheck_rerun(
+    rerun: Optional[RerunSource],
+    rerun_select: str,
+    target_ids: Optional[List[str]],
+    regions: Optional[Union[List[str], str]],
+) -> None:
+    if rerun_select not in RERUN_SELECTIONS:
+        raise ValueError(
+            f"rerun_select must be one of {', '.join(RERUN_SELECTIONS)}. "
+            f"Got {repr(rerun_select)}."
+        )
+    if rerun is None:
+        return
+    if not isinstance(rerun, (dict, str)):
+        raise TypeError(
+            f"rerun must be a previous cove output or a journal path. "
+            f"Got {repr(rerun)}."
+        )
+    for name, value in [("target_ids", target_ids), ("regions", regions)]:
+        if value is not None:
+            raise ValueError(
+                f"{name} can't be used with rerun, which targets the previous "
+                f"run's accounts and regions."
+            )
+
+
+def _typecheck_scope(scope: str) -> None:
+    if scope not in SCOPES:
+        raise ValueError(
+            f"scope must be one of {', '.join(SCOPES)}. Got {repr(scope)}."
+        )
+
+
+def _check_context_arguments(
+    context: Optional[CoveContext],
+    assuming_session: Optional[Session],
+    credential_cache: Optional[CoveCredentialCache],
+    org_cache: Optional[CoveOrgCache],
+    org_rate: Optional[RateLimit],
+) -> None:
+    if context is None:
+        return
+    for name, value in [
+        ("assuming_session", assuming_session),
+        ("credential_cache", credential_cache),
+        ("org_cache", org_cache),
+        ("org_rate", org_rate),
+    ]:
+        if value is not None:
+            raise ValueError(
+                f"{name} can't be used with context. Pass it to CoveContext instead."
+            )
+
+
 def _typecheck_external_id(external_id: Optional[str]) -> None:
     if external_id is None:
         return
@@ -0,0 +1,135 @@
+import json
+import logging
+import statistics
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from botocove.cove_files import write_private_json
+from botocove.cove_types import CoveSessionInformation
+
+logger = logging.getLogger(__name__)
+
+# The function's module and qualified name, the account id and the region
+DurationKey = Tuple[str, str, str]
+
+# Weight given to the latest duration over those seen before it
+DURATION_SMOOTHING = 0.5
+
+
+class CoveDurationStats(object):
+    """Remembers how long the decorated function took in each account and region
+    so cove can start the sessions expected to take longest first. Starting
+    them first (longest processing time scheduling) stops a few large accounts,
+    started last, from setting how long a run takes.
+
+    Durations are smoothed over runs, keyed on the function's module and
+    qualified name, the account id and the region. Sessions with no recorded
+    duration are expected to take the median of the function's others.
+
+    Pass the same instance to several calls to share durations between them. If
+    a path is given, durations are loaded from it on creation and merged back
+    into it by save()."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+
+        self._durations: Dict[DurationKey, float] = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None:
+            self._durations.update(_read_durations_file(self.path))
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    def expected(
+        self, function: str, account_id: str, region: Optional[str]
+    ) -> Optional[float]:
+        with self._lock:
+            return self._durations.get((function, account_id, region or ""))
+
+    def record(
+        self, function: str, account_id: str, region: Optional[str], seconds: float
+    ) -> None:
+        key = (function, account_id, region or "")
+        with self._lock:
+            previous = self._durations.get(key)
+            if previous is not None:
+                seconds = previous + DURATION_SMOOTHING * (seconds - previous)
+            self._durations[key] = seconds
+
+    def longest_first(
+        self, function: str, sessions: Iterable[CoveSessionInformation]
+    ) -> List[CoveSessionInformation]:
+        """Orders sessions by their expected duration, longest first. Ties keep
+        their original order."""
+
+        with self._lock:
+            known = [
+                seconds
+                for (key_function, _, _), seconds in self._durations.items()
+                if key_function == function
+            ]
+        default = statistics.median(known) if known else 0.0
+
+        def expected_seconds(session_info: CoveSessionInformation) -> float:
+            seconds = self.expected(
+                function, session_info["Id"], session_info["Region"]
+            )
+            return default if seconds is None else seconds
+
+        return sorted(sessions, key=expected_seconds, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._durations.clear()
+
+    def save(self) -> None:
+        """Merges the durations in memory with those already in the stats file,
+        so concurrent processes sharing the file don't drop each other's
+        entries."""
+
+        if self.path is None:
+            return
+
+        with self._lock:
+            merged = _read_durations_file(self.path)
+            merged.update(self._durations)
+
+        write_private_json(
+            self.path,
+            [
+                {"Function": function, "Id": account_id, "Region": region, "Seconds": s}
+                for (function, account_id, region), s in merged.items()
+            ],
+        )
+
+
+def function_name(func: Callable[..., Any]) -> str:
+    # Callable objects and partials have no name of their own
+    name = getattr(func, "__qualname__", type(func).__qualname__)
+    return f"{func.__module__}.{name}"
+
+
+def _read_durations_file(path: str) -> Dict[DurationKey, float]:
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        logger.warning(f"Ignoring unreadable duration stats file {path}")
+        return {}
+
+    if not isinstance(entries, list):
+        logger.warning(f"Ignoring unreadable duration stats file {path}")
+        return {}
+
+    durations: Dict[DurationKey, float] = {}
+    for entry in entries:
+        try:
+            key = (str(entry["Function"]), str(entry["Id"]), str(entry["Region"]))
+            durations[key] = float(entry["Seconds"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed entry in duration stats file {path}")
+    return durations
@@ -0,0 +1,19 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def write_private_json(path: str, data: Any) -> None:
+    """Writes data as JSON readable by the current user only. The file is
+    replaced atomically so concurrent readers never see a partial write."""
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".botocove-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -1,21 +1,50 @@
+import functools
 import logging
 import re
-from functools import lru_cache
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from boto3.session import Session
-from botocore.config import Config
 from botocore.exceptions import ClientError
 from mypy_boto3_organizations.type_defs import AccountTypeDef
 from mypy_boto3_sts.type_defs import PolicyDescriptorTypeTypeDef
 
-from botocove.cove_types import CoveSessionInformation
+from botocove.cove_context import (
+    CoveContext,
+    create_account_client,
+    create_org_client,
+    create_sts_client,
+)
+from botocove.cove_org_cache import CoveOrgCache, build_org_index, new_org_snapshot
+from botocove.cove_rate_limiter import CoveRateLimiter
+from botocove.cove_types import CoveOrgIndex, CoveOrgSnapshot, CoveSessionInformation
 
 logger = logging.getLogger(__name__)
 
 
 DEFAULT_ROLENAME = "OrganizationAccountAccessRole"
 
+# Whether the function runs in every target region, or once per account
+SCOPES = ("region", "account")
+
+# Passed as regions to run in every region each target account has enabled
+ENABLED_REGIONS = "enabled"
+
+# The opt in statuses of regions an account can use
+ENABLED_REGION_STATUSES = ["ENABLED", "ENABLED_BY_DEFAULT"]
+
 
 class CoveHostAccount(object):
     target_regions: Sequence[Optional[str]]
@@ -32,39 +61,57 @@ class CoveHostAccount(object):
         external_id: Optional[str],
         assuming_session: Optional[Session],
         thread_workers: int,
-        regions: Optional[List[str]],
+        regions: Optional[Union[Sequence[Optional[str]], str]],
         partition: Optional[str],
+        org_cache: Optional[CoveOrgCache] = None,
+        context: Optional[CoveContext] = None,
+        org_rate_limiter: Optional[CoveRateLimiter] = None,
+        work_items: Optional[Set[Tuple[str, Optional[str]]]] = None,
+        scope: str = "region",
     ) -> None:
 
         self.thread_workers = thread_workers
-
-        if assuming_session:
-            logger.info(f"Using provided Boto3 session {assuming_session}")
+        # When set, only these accounts and regions are run, such as a previous
+        # run's failures.
+        self.work_items = work_items
+        self.scope = scope
+
+        if context is not None:
+            assuming_session = context.assuming_session
+            self.sts_client = context.sts_client
+            self.org_client = context.org_client
+            caller_id = context.caller_identity
+            org_cache = context.org_cache
         else:
-            logger.info("No Boto3 session argument: using credential chain")
-            assuming_session = Session()
-
-        self.sts_client = assuming_session.client(
-            service_name="sts",
-            config=Config(max_pool_connections=self.thread_workers),
-        )
-
-        self.org_client = assuming_session.client(
-            service_name="organizations",
-            config=Config(max_pool_connections=self.thread_workers),
-        )
+            if assuming_session:
+                logger.info(f"Using provided Boto3 session {assuming_session}")
+            else:
+                logger.info("No Boto3 session argument: using credential chain")
+                assuming_session = Session()
+
+            self.sts_client = create_sts_client(assuming_session, thread_workers)
+            self.org_client = create_org_client(
+                assuming_session, thread_workers, org_rate_limiter
+            )
+            caller_id = self.sts_client.get_caller_identity()
 
-        caller_id = self.sts_client.get_caller_identity()
+        self.context = context
         self.host_account_id = caller_id["Account"]
+        self.caller_arn = caller_id["Arn"]
         self.host_account_partition = caller_id["Arn"].split(":")[1]
 
         if regions is None:
             self.target_regions = [assuming_session.region_name]
-        else:
+        elif regions != ENABLED_REGIONS:
             self.target_regions = regions
 
+        # Without a cache passed in, OU listings are only reused within this call.
+        self.org_snapshot = new_org_snapshot({})
+        self.org_index: Optional[CoveOrgIndex] = None
         try:
-            self.organization_account_ids: Set[str] = self._get_active_org_accounts()
+            self.org_snapshot = self._get_org_snapshot(org_cache)
+            self.account_data = self.org_snapshot["Accounts"]
+            self.organization_account_ids: Set[str] = set(self.account_data)
         except ClientError as e:
             logger.info(
                 "Cove does not have the ability to call ListAccounts - "
@@ -82,6 +129,22 @@ class CoveHostAccount(object):
             raise ValueError(
                 "There are no eligible account ids to run decorated func against"
             )
+        self._check_target_accounts_are_active()
+
+        # Each account's enabled regions, when running in just those
+        self.enabled_regions: Optional[Dict[str, List[str]]] = None
+        if regions == ENABLED_REGIONS:
+            self.enabled_regions = self._get_enabled_regions(assuming_session)
+            self.target_regions = sorted(
+                {
+                    r
+                    for account_regions in self.enabled_regions.values()
+                    for r in account_regions
+                }
+            )
+
+        if org_cache is not None:
+            org_cache.save()
 
         self.partition = partition or self.host_account_partition
         self.role_to_assume = rolename or DEFAULT_ROLENAME
@@ -90,61 +153,103 @@ class CoveHostAccount(object):
         self.policy_arns = policy_arns
         self.external_id = external_id
 
+    @property
+    def session_count(self) -> int:
+        if self.work_items is None and self.enabled_regions is None:
+            if self.scope == "account":
+                return len(self.target_accounts)
+            return len(self.target_regions) * len(self.target_accounts)
+        return sum(1 for _ in self._iter_work_items())
+
     def get_cove_sessions(self) -> List[CoveSessionInformation]:
+        return list(self.iter_cove_sessions())
+
+    def iter_cove_sessions(self) -> Iterator[CoveSessionInformation]:
+        """Lazily generates the session information for each target account and
+        region, so runners need only hold the sessions they are working on."""
+
         logger.info(f"Getting session information for {self.target_accounts=}")
         logger.info(f"AWS Partition: {self.partition=}")
         logger.info(f"Role: {self.role_to_assume=} {self.role_session_name=}")
         logger.info(f"Session policy: {self.policy_arns=} {self.policy=}")
-        return list(self._generate_account_sessions())
+        return self._generate_account_sessions()
+
+    def _iter_work_items(self) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yields the account and region of each session to run. Account scoped
+        functions run once per account, in the first of its target regions."""
+
+        if self.scope == "account":
+            for account_id in self.target_accounts:
+                for region in self.target_regions:
+                    if self._is_work_item(account_id, region):
+                        yield account_id, region
+                        break
+            return
 
-    def _generate_account_sessions(self) -> Iterable[CoveSessionInformation]:
         for region in self.target_regions:
             for account_id in self.target_accounts:
-                if self.account_data is not None:
-
-                    # If running with target accounts, but with organization data
-                    # available, i.e., running from org master but not targeting
-                    # whole org.
-                    if account_id not in self.account_data:
-                        raise ValueError(
-                            f"Account {account_id} is not ACTIVE in the organization."
-                        )
-
-                    yield CoveSessionInformation(
-                        Id=account_id,
-                        RoleName=self.role_to_assume,
-                        RoleSessionName=self.role_session_name,
-                        Policy=self.policy,
-                        PolicyArns=self.policy_arns,
-                        ExternalId=self.external_id,
-                        AssumeRoleSuccess=False,
-                        Region=region,
-                        Partition=self.partition,
-                        ExceptionDetails=None,
-                        Name=self.account_data[account_id]["Name"],
-                        Arn=self.account_data[account_id]["Arn"],
-                        Email=self.account_data[account_id]["Email"],
-                        Status=self.account_data[account_id]["Status"],
-                        Result=None,
-                    )
-                else:
-                    yield CoveSessionInformation(
-                        Id=account_id,
-                        RoleName=self.role_to_assume,
-                        RoleSessionName=self.role_session_name,
-                        Policy=self.policy,
-                        PolicyArns=self.policy_arns,
-                        ExternalId=self.external_id,
-                        AssumeRoleSuccess=False,
-                        Region=region,
-                        Partition=self.partition,
-                        ExceptionDetails=None,
-                        Name=None,
-                        Arn=None,
-                        Email=None,
-                        Status=None,
-                        Result=None,
-                    )
+                if self._is_work_item(account_id, region):
+                    yield account_id, region
+
+    def _is_work_item(self, account_id: str, region: Optional[str]) -> bool:
+        if (
+            self.enabled_regions is not None
+            and region not in self.enabled_regions[account_id]
+        ):
+            return False
+        return self.work_items is None or (account_id, region) in self.work_items
+
+    def _generate_account_sessions(self) -> Iterator[CoveSessionInformation]:
+        for account_id, region in self._iter_work_items():
+            if self.account_data is not None:
+                yield CoveSessionInformation(
+                    Id=account_id,
+                    RoleName=self.role_to_assume,
+                    RoleSessionName=self.role_session_name,
+                    Policy=self.policy,
+                    PolicyArns=self.policy_arns,
+                    ExternalId=self.external_id,
+                    AssumeRoleSuccess=False,
+                    Region=region,
+                    Partition=self.partition,
+                    ExceptionDetails=None,
+                    Name=self.account_data[account_id]["Name"],
+                    Arn=self.account_data[account_id]["Arn"],
+                    Email=self.account_data[account_id]["Email"],
+                    Status=self.account_data[account_id]["Status"],
+                    Result=None,
+                )
+            else:
+                yield CoveSessionInformation(
+                    Id=account_id,
+                    RoleName=self.role_to_assume,
+                    RoleSessionName=self.role_session_name,
+                    Policy=self.policy,
+                    PolicyArns=self.policy_arns,
+                    ExternalId=self.external_id,
+                    AssumeRoleSuccess=False,
+                    Region=region,
+                    Partition=self.partition,
+                    ExceptionDetails=None,
+                    Name=None,
+                    Arn=None,
+                    Email=None,
+                    Status=None,
+                    Result=None,
+                )
+
+    def _check_target_accounts_are_active(self) -> None:
+        """Sessions are generated lazily while the run is under way, so targets
+        missing from the organization data are rejected before anything runs."""
+
+        if self.account_data is None:
+            return
+
+        for account_id in sorted(self.target_accounts):
+            if account_id not in self.account_data:
+                raise ValueError(
+                    f"Account {account_id} is not ACTIVE in the organization."
+                )
 
     def _resolve_target_accounts(self, target_ids: Optional[List[str]]) -> Set[str]:
         accounts_to_ignore = self._gather_ignored_accounts()
@@ -164,8 +269,7 @@ class CoveHostAccount(object):
             accs, ous = self._get_validated_ids(self.provided_ignore_ids)
             ignored_accounts.update(accs)
             if ous:
-                accs_from_ous = self._get_all_accounts_by_organization_units(ous)
-                ignored_accounts.update(accs_from_ous)
+                ignored_accounts.update(self._get_accounts_in_ous(ous))
 
         return ignored_accounts
 
@@ -173,8 +277,7 @@ class CoveHostAccount(object):
         if targets:
             accs, ous = self._get_validated_ids(targets)
             if ous:
-                accs_from_ous = self._get_all_accounts_by_organization_units(ous)
-                accs.extend(accs_from_ous)
+                accs.extend(self._get_accounts_in_ous(ous))
             return set(accs)
         else:
             # No target_ids passed, getting all accounts in org
@@ -202,69 +305,153 @@ class CoveHostAccount(object):
 
         return accounts, ous
 
-    def _get_all_accounts_by_organization_units(
-        self, target_ous: List[str]
-    ) -> List[str]:
-
-        account_list: List[str] = []
-
-        for parent_ou in target_ous:
-
-            current_ou_list: List[str] = []
-
-            # current_ou_list is mutated and recursivly populated with all childs
-            self._get_all_child_ous(parent_ou, current_ou_list)
-
-            # for complete list add parent ou as well to list of child ous
-            current_ou_list.append(parent_ou)
-
-            account_list.extend(
-                self._get_accounts_by_organization_units(current_ou_list)
+    def _get_accounts_in_ous(self, ous: List[str]) -> Set[str]:
+        """Resolves OUs to their descendant accounts through the organization
+        index, so any mix of target and ignored OUs costs one walk of the
+        organization."""
+
+        index = self._get_org_index()
+        accounts: Set[str] = set()
+        unindexed_ous: List[str] = []
+        for ou in ous:
+            if ou in index["DescendantAccounts"]:
+                accounts.update(index["DescendantAccounts"][ou])
+            else:
+                unindexed_ous.append(ou)
+
+        # OUs created since a cached snapshot was taken are walked directly. An
+        # OU that doesn't exist raises from ListChildren as before.
+        if unindexed_ous:
+            accounts.update(
+                account
+                for ou in self._walk_organization_units(unindexed_ous)
+                for account in self._get_child_accounts(ou)
             )
 
-        return account_list
-
-    def _get_all_child_ous(self, parent_ou: str, ou_list: List[str]) -> None:
-        """Depth-first recursion mutates the current_ou_list present in the calling
-        function to establish all children of a parent OU"""
-
-        child_ous = self._get_child_ous(parent_ou)
-        ou_list.extend(child_ous)
+        return accounts
+
+    def _get_org_index(self) -> CoveOrgIndex:
+        if self.org_index is None:
+            if not self.org_snapshot["RootIds"]:
+                root_ids = self._list_root_ids()
+                self._walk_organization_units(root_ids)
+                self.org_snapshot["RootIds"] = root_ids
+            self.org_index = build_org_index(self.org_snapshot)
+        return self.org_index
+
+    def _walk_organization_units(self, parent_ous: List[str]) -> List[str]:
+        """Walks the OU trees under the parent OUs breadth first, listing the
+        children of every OU into the org snapshot, and returns every OU seen.
+        The ListChildren calls for each level run concurrently, so walking a wide
+        OU takes time proportional to the depth of the tree rather than its
+        number of OUs."""
+
+        level = list(dict.fromkeys(parent_ous))
+        walked_ous = list(level)
+        seen_ous = set(level)
+
+        with self._discovery_executor() as executor:
+            while level:
+                child_ous = list(executor.map(self._get_child_ous, level))
+                # Listed for the snapshot; the results are read back from it.
+                list(executor.map(self._get_child_accounts, level))
+
+                level = []
+                for ous in child_ous:
+                    for ou in ous:
+                        if ou not in seen_ous:
+                            seen_ous.add(ou)
+                            walked_ous.append(ou)
+                            level.append(ou)
+
+        return walked_ous
+
+    def _get_enabled_regions(self, assuming_session: Session) -> Dict[str, List[str]]:
+        """Finds the regions each target account has enabled. Accounts already
+        in the organization snapshot aren't looked up again, and the rest are
+        looked up concurrently."""
+
+        known = self.org_snapshot["EnabledRegions"]
+        unknown = sorted(a for a in self.target_accounts if a not in known)
+        if unknown:
+            account_client = create_account_client(
+                assuming_session, self.thread_workers
+            )
+            with self._discovery_executor() as executor:
+                listed = list(
+                    executor.map(
+                        functools.partial(self._list_enabled_regions, account_client),
+                        unknown,
+                    )
+                )
+            known.update(zip(unknown, listed))
 
-        for ou in child_ous:
-            self._get_all_child_ous(ou, ou_list)
+        return {account_id: known[account_id] for account_id in self.target_accounts}
 
-    def _get_accounts_by_organization_units(
-        self, organization_units: List[str]
-    ) -> List[str]:
+    def _list_enabled_regions(self, account_client: Any, account_id: str) -> List[str]:
+        try:
+            pages = account_client.get_paginator("list_regions").paginate(
+                AccountId=account_id,
+                RegionOptStatusContains=ENABLED_REGION_STATUSES,
+            )
+            return sorted(
+                region["RegionName"] for page in pages for region in page["Regions"]
+            )
+        except ClientError:
+            logger.error(
+                "Cove can only look up the regions an account has enabled when "
+                "running from the organization's management account or by a member "
+                "account that is a delegated administrator for AWS Account "
+                "Management: "
+                "https://docs.aws.amazon.com/accounts/latest/reference/API_ListRegions.html"  # noqa: E501
+            )
+            raise
 
-        account_list: List[str] = []
+    def _discovery_executor(self) -> ContextManager[Executor]:
+        if self.context is not None:
+            return nullcontext(self.context.executor)
+        return ThreadPoolExecutor(max_workers=self.thread_workers)
 
-        for ou in organization_units:
-            ou_children = self._get_child_accounts(ou)
-            account_list.extend(ou_children)
+    def _get_org_snapshot(self, org_cache: Optional[CoveOrgCache]) -> CoveOrgSnapshot:
+        key = f"{self.host_account_partition}:{self.host_account_id}"
+        if org_cache is not None:
+            snapshot = org_cache.get(key)
+            if snapshot is not None:
+                logger.info(f"Using cached organization snapshot for {key}")
+                return snapshot
 
-        return account_list
+        snapshot = new_org_snapshot(self._get_active_org_accounts())
+        if org_cache is not None:
+            org_cache.put(key, snapshot)
+        return snapshot
 
-    def _get_active_org_accounts(self) -> Set[str]:
-        """Captures all account metadata into self.account_data for future lookup and
-        returns a set of account IDs in the AWS organization."""
+    def _get_active_org_accounts(self) -> Dict[str, AccountTypeDef]:
+        """Returns the metadata of every active account in the AWS organization,
+        keyed on account ID."""
 
         pages = self.org_client.get_paginator("list_accounts").paginate()
-        self.account_data: Dict[str, AccountTypeDef] = {
+        return {
             account["Id"]: account
             for page in pages
             for account in page["Accounts"]
             if account["Status"] == "ACTIVE"
         }
 
-        return set(self.account_data.keys())
+    def _list_root_ids(self) -> List[str]:
+        pages = self.org_client.get_paginator("list_roots").paginate()
+        return [root["Id"] for page in pages for root in page["Roots"]]
 
-    @lru_cache()
     def _get_child_ous(self, parent_ou: str) -> List[str]:
         """List the child organizational units (OUs) of the parent OU. Just the ID
         is needed to traverse the organization tree."""
 
+        child_ous = self.org_snapshot["ChildOus"].get(parent_ou)
+        if child_ous is None:
+            child_ous = self._list_child_ous(parent_ou)
+            self.org_snapshot["ChildOus"][parent_ou] = child_ous
+        return child_ous
+
+    def _list_child_ous(self, parent_ou: str) -> List[str]:
         try:
             pages = self.org_client.get_paginator("list_children").paginate(
                 ParentId=parent_ou, ChildType="ORGANIZATIONAL_UNIT"
@@ -279,11 +466,17 @@ class CoveHostAccount(object):
             )
             raise
 
-    @lru_cache()
     def _get_child_accounts(self, parent_ou: str) -> List[str]:
         """List the child accounts of the parent organizational unit (OU). Just the ID is
         needed to access the account. The metadata is enriched elsewhere."""
 
+        child_accounts = self.org_snapshot["ChildAccounts"].get(parent_ou)
+        if child_accounts is None:
+            child_accounts = self._list_child_accounts(parent_ou)
+            self.org_snapshot["ChildAccounts"][parent_ou] = child_accounts
+        return child_accounts
+
+    def _list_child_accounts(self, parent_ou: str) -> List[str]:
         pages = self.org_client.get_paginator("list_children").paginate(
             ParentId=parent_ou, ChildType="ACCOUNT"
         )
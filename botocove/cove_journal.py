@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import threading
+from typing import IO, Any, Dict, Optional, Tuple
+
+from botocove.cove_types import CoveSessionInformation
+
+logger = logging.getLogger(__name__)
+
+# An account id and region
+JournalKey = Tuple[str, Optional[str]]
+
+
+class JournalledException(Exception):
+    """Stands in for an exception read back from a journal, which holds only
+    its type's name and message."""
+
+    def __init__(self, exception_type: str, message: str) -> None:
+        super().__init__(message)
+        self.exception_type = exception_type
+
+    def __repr__(self) -> str:
+        return f"{self.exception_type}({str(self)!r})"
+
+
+class CoveJournal(object):
+    """An append-only JSON Lines file recording each session's record as it
+    finishes, so a run that dies part way can be resumed without redoing the
+    sessions that had finished.
+
+    Results are stored as JSON. Values JSON can't represent are stored as their
+    str(), and exceptions as their type's name and message, so records read back
+    carry a JournalledException in ExceptionDetails. The file may hold results,
+    so it's created readable by the current user only."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+
+    def read(self) -> Dict[JournalKey, CoveSessionInformation]:
+        """The latest record for each account and region. A line cut short by
+        the run dying while writing it is skipped."""
+
+        records: Dict[JournalKey, CoveSessionInformation] = {}
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = _deserialize_record(json.loads(line))
+                    except (KeyError, TypeError, ValueError):
+                        logger.warning(
+                            f"Ignoring malformed line in journal {self.path}"
+                        )
+                        continue
+                    records[(record["Id"], record["Region"])] = record
+        except FileNotFoundError:
+            pass
+        return records
+
+    def open(self, resume: bool) -> None:
+        """Starts writing, after any records already in the file when resuming or
+        over them when not."""
+
+        # A line cut short mustn't swallow the next record
+        cut_short = resume and _ends_mid_line(self.path)
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if resume else os.O_TRUNC)
+        self._file = os.fdopen(os.open(self.path, flags, 0o600), "a")
+        if cut_short:
+            self._file.write("\n")
+
+    def append(self, record: CoveSessionInformation) -> None:
+        if self._file is None:
+            raise ValueError("The journal must be opened before it's written to")
+        line = json.dumps(_serialize_record(record), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            # Flushed per record so a killed run loses at most the one in hand
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _ends_mid_line(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except FileNotFoundError:
+        return False
+
+
+def _serialize_record(record: CoveSessionInformation) -> Dict[str, Any]:
+    serialized: Dict[str, Any] = dict(record)
+    error = record["ExceptionDetails"]
+    if error is not None:
+        serialized["ExceptionDetails"] = {
+            "Type": getattr(error, "exception_type", type(error).__name__),
+            "Message": str(error),
+        }
+    return serialized
+
+
+def _deserialize_record(entry: Dict[str, Any]) -> CoveSessionInformation:
+    error = entry.get("ExceptionDetails")
+    record = CoveSessionInformation(
+        Id=str(entry["Id"]),
+        RoleName=entry["RoleName"],
+        AssumeRoleSuccess=bool(entry["AssumeRoleSuccess"]),
+        Arn=entry.get("Arn"),
+        Email=entry.get("Email"),
+        Name=entry.get("Name"),
+        Status=entry.get("Status"),
+        RoleSessionName=entry.get("RoleSessionName"),
+        Policy=entry.get("Policy"),
+        PolicyArns=entry.get("PolicyArns"),
+        ExternalId=entry.get("ExternalId"),
+        Result=entry.get("Result"),
+        ExceptionDetails=(
+            JournalledException(error["Type"], error["Message"])
+            if error is not None
+            else None
+        ),
+        Region=entry.get("Region"),
+        Partition=entry.get("Partition"),
+    )
+    if "Attempts" in entry:
+        record["Attempts"] = int(entry["Attempts"])
+    return record
@@ -0,0 +1,210 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from mypy_boto3_organizations.type_defs import AccountTypeDef
+
+from botocove.cove_files import write_private_json
+from botocove.cove_types import CoveOrgIndex, CoveOrgSnapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 900
+
+
+class CoveOrgCache(object):
+    """Keeps a snapshot of an organization's accounts and OU tree so target
+    discovery doesn't list the organization again on every cove call.
+
+    Snapshots are keyed on the partition and account id of the host account and
+    are reused until ttl_seconds after ListAccounts was called. OU listings and
+    the regions each account has enabled are added to a snapshot as cove
+    discovers them and expire with it.
+
+    Each cove call discovers the organization afresh unless a cache is passed in,
+    so pass the same instance to several calls to share a snapshot between them.
+    If a path is given, unexpired snapshots are loaded from it on creation and
+    merged back into it by save()."""
+
+    def __init__(
+        self, ttl_seconds: int = DEFAULT_TTL_SECONDS, path: Optional[str] = None
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+
+        self._snapshots: Dict[str, CoveOrgSnapshot] = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None:
+            self._snapshots.update(
+                (key, snapshot)
+                for key, snapshot in _read_snapshots_file(self.path).items()
+                if self._is_fresh(snapshot)
+            )
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def get(self, key: str) -> Optional[CoveOrgSnapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                return None
+            if not self._is_fresh(snapshot):
+                del self._snapshots[key]
+                return None
+            return snapshot
+
+    def put(self, key: str, snapshot: CoveOrgSnapshot) -> None:
+        with self._lock:
+            self._snapshots[key] = snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def save(self) -> None:
+        """Merges the unexpired snapshots in memory with those already in the
+        cache file, so concurrent processes sharing the file don't drop each
+        other's entries."""
+
+        if self.path is None:
+            return
+
+        with self._lock:
+            merged = _read_snapshots_file(self.path)
+            merged.update(self._snapshots)
+            entries = {
+                key: _serialize_snapshot(snapshot)
+                for key, snapshot in merged.items()
+                if self._is_fresh(snapshot)
+            }
+
+        write_private_json(self.path, entries)
+
+    def _is_fresh(self, snapshot: CoveOrgSnapshot) -> bool:
+        return time.time() - snapshot["CreatedAt"] < self.ttl_seconds
+
+
+def new_org_snapshot(accounts: Dict[str, AccountTypeDef]) -> CoveOrgSnapshot:
+    return CoveOrgSnapshot(
+        CreatedAt=time.time(),
+        Accounts=accounts,
+        RootIds=[],
+        ChildOus={},
+        ChildAccounts={},
+        EnabledRegions={},
+    )
+
+
+def build_org_index(snapshot: CoveOrgSnapshot) -> CoveOrgIndex:
+    """Indexes a snapshot holding a walk of the whole organization. Every OU maps
+    to the accounts anywhere beneath it, and every account to the OUs above it,
+    nearest first."""
+
+    ou_ancestors: Dict[str, List[str]] = {
+        root_id: [] for root_id in snapshot["RootIds"]
+    }
+    queue = deque(snapshot["RootIds"])
+    walk_order: List[str] = []
+    while queue:
+        parent = queue.popleft()
+        walk_order.append(parent)
+        for ou in snapshot["ChildOus"].get(parent, []):
+            if ou not in ou_ancestors:
+                ou_ancestors[ou] = [ou] + ou_ancestors[parent]
+                queue.append(ou)
+
+    # Walking backwards visits every OU's children before the OU itself
+    descendant_accounts: Dict[str, Set[str]] = {}
+    account_ancestors: Dict[str, List[str]] = {}
+    for parent in reversed(walk_order):
+        accounts = set(snapshot["ChildAccounts"].get(parent, []))
+        for account in accounts:
+            account_ancestors[account] = ou_ancestors[parent]
+        for ou in snapshot["ChildOus"].get(parent, []):
+            accounts.update(descendant_accounts.get(ou, set()))
+        descendant_accounts[parent] = accounts
+
+    return CoveOrgIndex(
+        DescendantAccounts=descendant_accounts, AncestorOus=account_ancestors
+    )
+
+
+def _serialize_snapshot(snapshot: CoveOrgSnapshot) -> Dict[str, Any]:
+    return {
+        "CreatedAt": snapshot["CreatedAt"],
+        "Accounts": {
+            account_id: _serialize_account(account)
+            for account_id, account in snapshot["Accounts"].items()
+        },
+        "RootIds": list(snapshot["RootIds"]),
+        "ChildOus": dict(snapshot["ChildOus"]),
+        "ChildAccounts": dict(snapshot["ChildAccounts"]),
+        "EnabledRegions": dict(snapshot["EnabledRegions"]),
+    }
+
+
+def _serialize_account(account: AccountTypeDef) -> Dict[str, Any]:
+    serialized: Dict[str, Any] = dict(account)
+    if "JoinedTimestamp" in account:
+        serialized["JoinedTimestamp"] = account["JoinedTimestamp"].isoformat()
+    return serialized
+
+
+def _deserialize_snapshot(entry: Dict[str, Any]) -> CoveOrgSnapshot:
+    accounts: Dict[str, AccountTypeDef] = {}
+    for account_id, account in entry["Accounts"].items():
+        if "JoinedTimestamp" in account:
+            account["JoinedTimestamp"] = datetime.fromisoformat(
+                account["JoinedTimestamp"]
+            )
+        accounts[str(account_id)] = account
+
+    return CoveOrgSnapshot(
+        CreatedAt=float(entry["CreatedAt"]),
+        Accounts=accounts,
+        RootIds=[str(root_id) for root_id in entry["RootIds"]],
+        ChildOus={
+            str(parent): [str(child) for child in children]
+            for parent, children in entry["ChildOus"].items()
+        },
+        ChildAccounts={
+            str(parent): [str(child) for child in children]
+            for parent, children in entry["ChildAccounts"].items()
+        },
+        # Absent from files written before enabled regions were cached
+        EnabledRegions={
+            str(account_id): [str(region) for region in regions]
+            for account_id, regions in entry.get("EnabledRegions", {}).items()
+        },
+    )
+
+
+def _read_snapshots_file(path: str) -> Dict[str, CoveOrgSnapshot]:
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        logger.warning(f"Ignoring unreadable organization cache file {path}")
+        return {}
+
+    if not isinstance(entries, dict):
+        logger.warning(f"Ignoring unreadable organization cache file {path}")
+        return {}
+
+    snapshots: Dict[str, CoveOrgSnapshot] = {}
+    for key, entry in entries.items():
+        try:
+            snapshots[key] = _deserialize_snapshot(entry)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            logger.warning(
+                f"Ignoring malformed entry in organization cache file {path}"
+            )
+    return snapshots
@@ -0,0 +1,63 @@
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+from botocore.loaders import Loader
+
+from botocove.cove_session import CoveSession, create_shared_loader
+from botocove.cove_types import CoveSessionInformation
+
+FunctionReference = Tuple[str, str]
+
+EXECUTORS = ("thread", "process")
+
+
+def create_process_executor() -> ProcessPoolExecutor:
+    # Spawned rather than forked: the parent is running threads, and forking a
+    # threaded process can deadlock the child on a lock held at fork time.
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+
+def function_reference(func: Callable[..., Any]) -> FunctionReference:
+    """Functions are sent to worker processes by name, as pickle can't send the
+    function cove wraps: its module attribute is cove's wrapper instead."""
+
+    reference = (func.__module__, func.__qualname__)
+    if "<locals>" in func.__qualname__ or resolve_function(reference) is not func:
+        raise ValueError(
+            f"{func.__qualname__} must be defined at the top level of a module "
+            "to run with executor='process'."
+        )
+    return reference
+
+
+def resolve_function(reference: FunctionReference) -> Callable[..., Any]:
+    module_name, qualname = reference
+    obj: Any = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        obj = getattr(obj, attribute)
+    # Unwraps cove's own wrapper, not any decorators beneath it
+    return getattr(obj, "__wrapped__", obj)  # type: ignore[no-any-return]
+
+
+def run_in_process(
+    reference: FunctionReference,
+    session_info: CoveSessionInformation,
+    session_args: Dict[str, Any],
+    func_args: Any,
+    func_kwargs: Any,
+) -> Any:
+    """Runs in a worker process, with a session rebuilt from the credentials the
+    parent process assumed."""
+
+    cove_session = CoveSession.from_session_args(
+        session_info, session_args, loader=_process_loader()
+    )
+    return resolve_function(reference)(cove_session, *func_args, **func_kwargs)
+
+
+@lru_cache(maxsize=None)
+def _process_loader() -> Loader:
+    return create_shared_loader()
@@ -0,0 +1,61 @@
+import math
+import threading
+import time
+from typing import Any, Optional, Union
+
+from botocore.client import BaseClient
+
+
+class CoveRateLimiter(object):
+    """A token bucket pacing API calls to at most rate calls per second, with
+    bursts of up to burst calls. Safe to share between threads: acquire() blocks
+    the calling thread until a call may be made."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError(f"rate must be a positive number. Got {repr(rate)}.")
+
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(1, math.ceil(rate))
+        if self.burst < 1:
+            raise ValueError(f"burst must be at least 1. Got {self.burst}.")
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def pace_client(self, client: BaseClient) -> None:
+        """Paces every API call the client makes, including each page fetched by
+        its paginators. Pacing a client twice with one limiter has no effect."""
+
+        client.meta.events.register(
+            "before-call", self._acquire_before_call, unique_id=f"botocove-{id(self)}"
+        )
+
+    def _acquire_before_call(self, **kwargs: Any) -> None:
+        self.acquire()
+
+
+RateLimit = Union[float, CoveRateLimiter]
+
+
+def as_rate_limiter(rate: Optional[RateLimit]) -> Optional[CoveRateLimiter]:
+    """Shares a limiter passed in, or creates one for a rate in calls per second."""
+
+    if rate is None or isinstance(rate, CoveRateLimiter):
+        return rate
+    return CoveRateLimiter(rate)
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Set, Union
+
+from botocove.cove_journal import CoveJournal, JournalKey
+from botocove.cove_types import CoveOutput
+
+# Which of a previous run's records to run again
+RERUN_SELECTIONS = {
+    "failed": ["Exceptions", "FailedAssumeRole"],
+    "exceptions": ["Exceptions"],
+    "failed_assume_role": ["FailedAssumeRole"],
+    "all": ["Results", "Exceptions", "FailedAssumeRole"],
+}
+
+# A previous run's output, or the path to its journal
+RerunSource = Union[CoveOutput, str]
+
+
+def select_work_items(source: RerunSource, select: str) -> Set[JournalKey]:
+    """The accounts and regions of a previous run's records in the selected
+    categories."""
+
+    if isinstance(source, str):
+        records = _categorize_journal(CoveJournal(source))
+    else:
+        records = {
+            "Results": _work_items(source["Results"]),
+            "Exceptions": _work_items(source["Exceptions"]),
+            "FailedAssumeRole": _work_items(source["FailedAssumeRole"]),
+        }
+    return {item for category in RERUN_SELECTIONS[select] for item in records[category]}
+
+
+def _work_items(records: List[Dict[str, Any]]) -> List[JournalKey]:
+    return [(record["Id"], record.get("Region")) for record in records]
+
+
+def _categorize_journal(journal: CoveJournal) -> Dict[str, List[JournalKey]]:
+    # Split as format_cove_output splits a run's output
+    records: Dict[str, List[JournalKey]] = {
+        "Results": [],
+        "Exceptions": [],
+        "FailedAssumeRole": [],
+    }
+    for key, record in journal.read().items():
+        if record["ExceptionDetails"] is None:
+            records["Results"].append(key)
+        elif record["AssumeRoleSuccess"]:
+            records["Exceptions"].append(key)
+        else:
+            records["FailedAssumeRole"].append(key)
+    return records
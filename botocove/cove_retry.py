@@ -0,0 +1,76 @@
+import random
+from typing import Callable, Optional
+
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+
+from botocove.cove_credentials import _is_throttling_error
+
+TRANSIENT_ERROR_CODES = {
+    "InternalError",
+    "InternalFailure",
+    "ServiceUnavailable",
+    "RequestTimeout",
+    "RequestTimeoutException",
+}
+
+
+class CoveRetryPolicy(object):
+    """Decides whether a failed session is tried again and how long it waits
+    first. A session is tried at most max_attempts times in all, waiting a random
+    time of up to base_delay seconds after its first failure, doubling with each
+    further failure up to max_delay.
+
+    retryable is called with the exception a session failed with and returns
+    whether it's worth trying again. By default only throttling, AWS server
+    errors and connection errors are retried."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0,
+        retryable: Optional[Callable[[Exception], bool]] = None,
+    ) -> None:
+        if (
+            isinstance(max_attempts, bool)
+            or not isinstance(max_attempts, int)
+            or max_attempts < 1
+        ):
+            raise ValueError(
+                f"max_attempts must be a positive int. Got {repr(max_attempts)}."
+            )
+        if not isinstance(base_delay, (int, float)) or base_delay < 0:
+            raise ValueError(
+                f"base_delay must be a non-negative number. Got {repr(base_delay)}."
+            )
+        if not isinstance(max_delay, (int, float)) or max_delay < base_delay:
+            raise ValueError(
+                f"max_delay must be a number no less than base_delay. "
+                f"Got {repr(max_delay)}."
+            )
+
+        self.max_attempts = max_attempts
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.retryable = retryable or is_transient_error
+
+    def should_retry(self, error: Exception, attempts: int) -> bool:
+        return attempts < self.max_attempts and self.retryable(error)
+
+    def delay(self, attempts: int) -> float:
+        """Full jitter: sessions failing together don't all retry together."""
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return random.uniform(0, ceiling)
+
+
+def is_transient_error(e: Exception) -> bool:
+    if isinstance(e, (ConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(e, ClientError):
+        return False
+    if _is_throttling_error(e):
+        return True
+    status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+    code = e.response.get("Error", {}).get("Code")
+    return code in TRANSIENT_ERROR_CODES or status >= 500
@@ -1,15 +1,56 @@
+import copy
+import heapq
 import logging
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-from typing import Any, Callable, Iterable, List
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import count, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from tqdm import tqdm
 
+from botocove.cove_abort import CoveAbortPolicy, CoveCircuitBreaker
+from botocove.cove_concurrency import CoveConcurrencyController
+from botocove.cove_context import CoveContext
+from botocove.cove_credentials import (
+    CoveCredentialCache,
+    CredentialKey,
+    _credential_key,
+)
+from botocove.cove_durations import CoveDurationStats, function_name
 from botocove.cove_host_account import CoveHostAccount
-from botocove.cove_session import CoveSession
-from botocove.cove_types import CoveFunctionOutput, CoveSessionInformation
+from botocove.cove_journal import CoveJournal, JournalKey
+from botocove.cove_process import (
+    create_process_executor,
+    function_reference,
+    run_in_process,
+)
+from botocove.cove_rate_limiter import RateLimit, as_rate_limiter
+from botocove.cove_retry import CoveRetryPolicy
+from botocove.cove_session import (
+    CoveSession,
+    build_assume_role_args,
+    create_shared_loader,
+    prewarm_loader,
+)
+from botocove.cove_types import CoveFunctionOutput, CoveOutput, CoveSessionInformation
 
 logger = logging.getLogger(__name__)
 
+WINDOW_PER_WORKER = 2
+ADAPTIVE_START_DIVISOR = 4
+
+# An activated session still to run, or a finished session's record
+StageOutcome = Union[CoveSession, CoveSessionInformation]
+# When a failed session may be resubmitted, a tiebreak, the session to resubmit
+# and a copy of its failed record
+PendingRetry = Tuple[float, int, CoveSessionInformation, CoveSessionInformation]
+
 
 class CoveRunner(object):
     def __init__(
@@ -20,10 +61,37 @@ class CoveRunner(object):
         func_args: Any,
         func_kwargs: Any,
         thread_workers: int,
+        credential_cache: Optional[CoveCredentialCache] = None,
+        services: Optional[List[str]] = None,
+        max_in_flight: Optional[int] = None,
+        context: Optional[CoveContext] = None,
+        executor: str = "thread",
+        assume_role_workers: Optional[int] = None,
+        assume_role_rate: Optional[RateLimit] = None,
+        adaptive_concurrency: bool = False,
+        task_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        retry: Optional[CoveRetryPolicy] = None,
+        abort_on: Optional[CoveAbortPolicy] = None,
+        duration_stats: Optional[CoveDurationStats] = None,
+        journal: Optional[CoveJournal] = None,
+        resume: bool = False,
     ) -> None:
 
         self.host_account = host_account
-        self.sessions = host_account.get_cove_sessions()
+        self.context = context
+        # In process mode roles are still assumed on threads in this process;
+        # only the wrapped function runs in the worker processes.
+        self.func_reference = (
+            function_reference(func) if executor == "process" else None
+        )
+        self.process_executor: Optional[ProcessPoolExecutor] = None
+
+        # With assume_role_workers set, roles are assumed on a pool of their own
+        # and only sessions ready to run take up one of the thread_workers.
+        self.assume_role_workers = assume_role_workers
+        self.assume_role_executor: Optional[ThreadPoolExecutor] = None
+        self.assume_role_limiter = as_rate_limiter(assume_role_rate)
 
         self.cove_wrapped_func = func
         self.raise_exception = raise_exception
@@ -31,62 +99,482 @@ class CoveRunner(object):
         self.func_kwargs = func_kwargs
 
         self.thread_workers = thread_workers
+        # Enough queued work that a worker finishing never waits on submission,
+        # without queueing a future per session before any work has run.
+        self.max_in_flight = max_in_flight or thread_workers * WINDOW_PER_WORKER
+        # Adaptive runs treat thread_workers as a ceiling and keep only as many
+        # sessions in flight as the controller allows.
+        self.concurrency = (
+            CoveConcurrencyController(
+                initial=max(1, thread_workers // ADAPTIVE_START_DIVISOR),
+                maximum=thread_workers,
+            )
+            if adaptive_concurrency
+            else None
+        )
 
-    def run_cove_function(self) -> CoveFunctionOutput:
+        # Threads can't be stopped, so a task past its timeout, or still running
+        # at the deadline, is recorded as timed out and left to finish unwatched.
+        self.task_timeout = task_timeout
+        self.deadline = deadline
+        self._task_started: Dict[int, float] = {}
+        self.retry = retry
+        self.circuit_breaker = (
+            CoveCircuitBreaker(abort_on) if abort_on is not None else None
+        )
+        self.abort_reason: Optional[str] = None
+        self.duration_stats = duration_stats
+        self.func_name = function_name(func)
+        self.journal = journal
+        self.resume = resume
 
-        # The "Submit and Use as Completed" pattern as described in
-        # "ThreadPoolExecutor in Python: The Complete Guide".
-        # https://superfastpython.com/threadpoolexecutor-in-python/#Submit_and_Use_as_Completed
-        with ThreadPoolExecutor(max_workers=self.thread_workers) as executor:
-            futures: List["Future[CoveSessionInformation]"] = [
-                executor.submit(self.cove_thread, s) for s in self.sessions
-            ]
-            completed: List[CoveSessionInformation] = list(
-                tqdm(
-                    _iterate_results_in_order_of_completion(futures),
-                    total=len(self.sessions),
-                    desc="Executing function",
-                    colour="#ff69b4",  # hotpink
-                )
+        # Shared by every session in the run so each account's role is assumed
+        # once however many regions are targeted. Only a cache passed in by the
+        # caller outlives the run.
+        if context is not None:
+            self.credential_cache = context.credential_cache
+            self.loader = context.loader
+        else:
+            self.credential_cache = (
+                credential_cache
+                if credential_cache is not None
+                else CoveCredentialCache()
             )
+            self.loader = create_shared_loader()
+        # Scoped to this run only: a later run may find the role fixed.
+        self.assume_role_failures: Dict[CredentialKey, Exception] = {}
+        self.services = services or []
+
+    def run_cove_function(self) -> CoveFunctionOutput:
+        completed = list(self.iter_cove_function())
 
         successful_results = [
             result for result in completed if not result["ExceptionDetails"]
         ]
         exceptions = [result for result in completed if result["ExceptionDetails"]]
 
-        return CoveFunctionOutput(
+        output = CoveFunctionOutput(
             Results=successful_results,
             Exceptions=exceptions,
         )
+        if self.concurrency is not None:
+            output["Concurrency"] = self.concurrency.stats()
+        if self.abort_reason is not None:
+            output["AbortReason"] = self.abort_reason
+        return output
+
+    def reduce_cove_function(
+        self, reducer: Callable[[Any, Dict[str, Any]], Any], initial: Any
+    ) -> Any:
+        """Folds each record into a running aggregate as its session completes, so
+        the run's results are never held in memory together. The reducer is only
+        ever called from the calling thread."""
+
+        aggregate = copy.deepcopy(initial)
+        for record in self.iter_cove_function():
+            aggregate = reducer(aggregate, format_cove_record(record))
+        return aggregate
+
+    def iter_cove_function(self) -> Iterator[CoveSessionInformation]:
+        """Yields each session's result or exception as soon as it completes, so
+        callers can handle results without holding the whole run in memory. If
+        the caller stops iterating, sessions that haven't started are cancelled."""
+
+        prewarm_loader(self.loader, self.services)
+
+        # Sessions are drawn lazily and at most max_in_flight sessions are in
+        # either stage at once, topped up as each one completes, so memory and
+        # startup time don't grow with the number of targets.
+        sessions = self.host_account.iter_cove_sessions()
+        if self.duration_stats is not None:
+            # Ordering needs every session up front, so they're no longer lazy
+            sessions = iter(self.duration_stats.longest_first(self.func_name, sessions))
+        journalled: Dict[JournalKey, CoveSessionInformation] = {}
+        if self.journal is not None:
+            if self.resume:
+                journalled = self.journal.read()
+                sessions = (
+                    s for s in sessions if (s["Id"], s["Region"]) not in journalled
+                )
+            self.journal.open(resume=self.resume)
+        executor = (
+            self.context.executor
+            if self.context is not None
+            else ThreadPoolExecutor(max_workers=self.thread_workers)
+        )
+        if self.assume_role_workers is not None:
+            self.assume_role_executor = ThreadPoolExecutor(
+                max_workers=self.assume_role_workers,
+                thread_name_prefix="botocove-assume-role",
+            )
+        if self.func_reference is not None:
+            self.process_executor = create_process_executor()
+
+        def submit(session_info: CoveSessionInformation) -> "Future[StageOutcome]":
+            if self.assume_role_executor is not None:
+                future = self.assume_role_executor.submit(
+                    self.assume_stage, session_info
+                )
+            else:
+                future = executor.submit(self.cove_thread, session_info)
+            if self.retry is not None:
+                session_info.setdefault("Attempts", 1)
+            tasks[future] = session_info
+            return future
+
+        def window() -> int:
+            if self.concurrency is not None:
+                return self.concurrency.limit
+            return self.max_in_flight
+
+        tasks: Dict["Future[StageOutcome]", CoveSessionInformation] = {}
+        deadline_at = (
+            time.monotonic() + self.deadline if self.deadline is not None else None
+        )
+        # Timed out futures whose threads may still be running
+        abandoned: List["Future[StageOutcome]"] = []
+        skipped = 0
+        # Failed sessions wait here rather than in a worker thread, as a heap
+        # ordered by when each may be resubmitted.
+        retries: List[PendingRetry] = []
+        sequence = count()
+
+        in_flight: Set["Future[StageOutcome]"] = {
+            submit(s) for s in islice(sessions, window())
+        }
+        progress = tqdm(
+            total=self.host_account.session_count,
+            desc="Executing function",
+            colour="#ff69b4",  # hotpink
+        )
+        try:
+            # Finished by an earlier run, so they're only reported
+            for record in journalled.values():
+                progress.update()
+                yield record
+
+            while in_flight or retries:
+                timeout = self._wait_timeout(
+                    in_flight,
+                    tasks,
+                    deadline_at,
+                    retries[0][0] if retries else None,
+                )
+                if in_flight:
+                    done, in_flight = wait(
+                        in_flight, timeout=timeout, return_when=FIRST_COMPLETED
+                    )
+                else:
+                    done = set()
+                    time.sleep(timeout or 0)
+                records: List[CoveSessionInformation] = []
+                for future in done:
+                    outcome = future.result()
+                    session_info = tasks.pop(future)
+                    if isinstance(outcome, CoveSession):
+                        # Assumed by the first stage and ready for the second
+                        next_stage: "Future[StageOutcome]" = executor.submit(
+                            self.function_stage, outcome
+                        )
+                        tasks[next_stage] = session_info
+                        in_flight.add(next_stage)
+                    else:
+                        self._task_started.pop(id(session_info), None)
+                        if self.retry is not None and self._should_retry(outcome):
+                            attempts = outcome.get("Attempts", 1)
+                            ready_at = time.monotonic() + self.retry.delay(attempts)
+                            failed = copy.copy(outcome)
+                            self._reset_for_retry(outcome)
+                            heapq.heappush(
+                                retries, (ready_at, next(sequence), outcome, failed)
+                            )
+                        else:
+                            records.append(outcome)
+
+                past_deadline = (
+                    deadline_at is not None and time.monotonic() >= deadline_at
+                )
+                for future in self._expired_tasks(in_flight, tasks, past_deadline):
+                    in_flight.discard(future)
+                    session_info = tasks.pop(future)
+                    if future.cancel():
+                        skipped += 1
+                        continue
+                    abandoned.append(future)
+                    records.append(self._timed_out(session_info, past_deadline))
+
+                if self.abort_reason is None and self._should_abort(records):
+                    not_run = sum(1 for _ in sessions)
+                    for future in list(in_flight):
+                        if future.cancel():
+                            in_flight.discard(future)
+                            tasks.pop(future)
+                            not_run += 1
+                    records.extend(failed for _, _, _, failed in retries)
+                    retries.clear()
+                    logger.warning(
+                        f"Aborting the run: {self.abort_reason}. {not_run} sessions "
+                        f"were not run."
+                    )
+
+                if past_deadline:
+                    skipped += sum(1 for _ in sessions)
+                    # Out of time to try again, so report the last failure
+                    records.extend(failed for _, _, _, failed in retries)
+                    retries.clear()
+                elif self.abort_reason is None:
+                    capacity = max(0, window() - len(in_flight))
+                    now = time.monotonic()
+                    while capacity and retries and retries[0][0] <= now:
+                        in_flight.add(submit(heapq.heappop(retries)[2]))
+                        capacity -= 1
+                    in_flight.update(submit(s) for s in islice(sessions, capacity))
+                for record in records:
+                    if self.journal is not None:
+                        self.journal.append(record)
+                    progress.update()
+                    yield record
+        finally:
+            for future in in_flight:
+                future.cancel()
+            # A context's pool outlives the run, but its sessions must not. Those
+            # still running are waited on only until they'd time out.
+            while in_flight:
+                past_deadline = (
+                    deadline_at is not None and time.monotonic() >= deadline_at
+                )
+                expired = self._expired_tasks(in_flight, tasks, past_deadline)
+                abandoned.extend(expired)
+                in_flight.difference_update(expired)
+                if not in_flight:
+                    break
+                _, in_flight = wait(
+                    in_flight,
+                    timeout=self._wait_timeout(in_flight, tasks, deadline_at),
+                    return_when=FIRST_COMPLETED,
+                )
+            # Joining the pools would wait on the timed out tasks too
+            join = not abandoned
+            if self.context is None:
+                executor.shutdown(wait=join)
+            if self.assume_role_executor is not None:
+                self.assume_role_executor.shutdown(wait=join)
+            if self.process_executor is not None:
+                self.process_executor.shutdown(wait=join)
+            progress.close()
+            if skipped:
+                logger.warning(
+                    f"Deadline of {self.deadline}s passed before {skipped} "
+                    f"sessions started. They were not run."
+                )
+            # Keep credentials assumed before a raised exception too
+            self.credential_cache.save()
+            if self.duration_stats is not None:
+                self.duration_stats.save()
+            if self.journal is not None:
+                self.journal.close()
+
+    def _wait_timeout(
+        self,
+        in_flight: Set["Future[StageOutcome]"],
+        tasks: Dict["Future[StageOutcome]", CoveSessionInformation],
+        deadline_at: Optional[float],
+        next_retry_at: Optional[float] = None,
+    ) -> Optional[float]:
+        """Seconds until the next task could time out, a failed session may be
+        retried or the deadline passes, or None to wait for a task to complete
+        however long it takes."""
+
+        now = time.monotonic()
+        timeouts: List[float] = []
+        if deadline_at is not None:
+            timeouts.append(deadline_at - now)
+        if next_retry_at is not None:
+            timeouts.append(next_retry_at - now)
+        if self.task_timeout is not None:
+            for future in in_flight:
+                started = self._task_started.get(id(tasks[future]))
+                # A task yet to start can't time out sooner than this either
+                timeouts.append(
+                    self.task_timeout
+                    if started is None
+                    else started + self.task_timeout - now
+                )
+        return max(0.0, min(timeouts)) if timeouts else None
+
+    def _expired_tasks(
+        self,
+        in_flight: Set["Future[StageOutcome]"],
+        tasks: Dict["Future[StageOutcome]", CoveSessionInformation],
+        past_deadline: bool,
+    ) -> List["Future[StageOutcome]"]:
+        if past_deadline:
+            return list(in_flight)
+        if self.task_timeout is None:
+            return []
+
+        now = time.monotonic()
+        expired = []
+        for future in in_flight:
+            started = self._task_started.get(id(tasks[future]))
+            if started is not None and now - started >= self.task_timeout:
+                expired.append(future)
+        return expired
+
+    def _timed_out(
+        self, session_info: CoveSessionInformation, past_deadline: bool
+    ) -> CoveSessionInformation:
+        """Records the task as timed out in a copy of its session information, as
+        the abandoned thread may still write to the original."""
+
+        self._task_started.pop(id(session_info), None)
+        if past_deadline:
+            message = f"Session was still running at the {self.deadline}s deadline"
+        else:
+            message = f"Session exceeded the task_timeout of {self.task_timeout}s"
+        error = TimeoutError(
+            f"{message}: account {session_info['Id']}, "
+            f"region {session_info['Region']}"
+        )
+        if self.raise_exception is True:
+            raise error
+
+        record = copy.copy(session_info)
+        record["Result"] = None
+        record["ExceptionDetails"] = error
+        return record
 
     def cove_thread(
         self,
         account_session_info: CoveSessionInformation,
-    ) -> CoveSessionInformation:
+    ) -> StageOutcome:
+        outcome = self.assume_stage(account_session_info)
+        if isinstance(outcome, CoveSession):
+            return self.function_stage(outcome)
+        return outcome
+
+    def assume_stage(
+        self, account_session_info: CoveSessionInformation
+    ) -> StageOutcome:
+        """Returns the activated session, or the session's record if the role
+        couldn't be assumed."""
+
+        # A task's timeout runs from when its role assumption starts
+        self._task_started[id(account_session_info)] = time.monotonic()
         cove_session = CoveSession(
             account_session_info,
             sts_client=self.host_account.sts_client,
+            caller_arn=self.host_account.caller_arn,
+            credential_cache=self.credential_cache,
+            loader=self.loader,
+            assume_role_failures=self.assume_role_failures,
+            rate_limiter=self.assume_role_limiter,
         )
         try:
-            cove_session.activate_cove_session()
+            return cove_session.activate_cove_session()
+        except Exception as e:
+            return self._handle_exception(cove_session, e)
 
-            result = self.cove_wrapped_func(
-                cove_session, *self.func_args, **self.func_kwargs
-            )
+    def function_stage(self, cove_session: CoveSession) -> CoveSessionInformation:
+        started = time.monotonic()
+        try:
+            if self.process_executor is not None and self.func_reference:
+                result = self.process_executor.submit(
+                    run_in_process,
+                    self.func_reference,
+                    cove_session.session_information,
+                    cove_session.session_args,
+                    self.func_args,
+                    self.func_kwargs,
+                ).result()
+            else:
+                result = self.cove_wrapped_func(
+                    cove_session, *self.func_args, **self.func_kwargs
+                )
 
+            if self.duration_stats is not None:
+                # Only runs that finished say how long the account takes
+                self.duration_stats.record(
+                    self.func_name,
+                    cove_session.session_information["Id"],
+                    cove_session.session_information["Region"],
+                    time.monotonic() - started,
+                )
             return cove_session.format_cove_result(result)
 
         except Exception as e:
-            if self.raise_exception is True:
-                logger.exception(cove_session.format_cove_error(e))
-                raise
-            else:
-                return cove_session.format_cove_error(e)
+            return self._handle_exception(cove_session, e)
+
+        finally:
+            if self.concurrency is not None:
+                self.concurrency.observe(
+                    time.monotonic() - started, cove_session.throttle_count
+                )
+
+    def _should_abort(self, records: List[CoveSessionInformation]) -> bool:
+        if self.circuit_breaker is None:
+            return False
+        for record in records:
+            self.abort_reason = self.circuit_breaker.observe(record)
+            if self.abort_reason is not None:
+                return True
+        return False
+
+    def _should_retry(self, record: CoveSessionInformation) -> bool:
+        error = record["ExceptionDetails"]
+        return (
+            self.retry is not None
+            and self.abort_reason is None
+            and error is not None
+            and self.retry.should_retry(error, record.get("Attempts", 1))
+        )
+
+    def _reset_for_retry(self, session_info: CoveSessionInformation) -> None:
+        if not session_info["AssumeRoleSuccess"]:
+            # Let the retry call STS again rather than rethrowing this failure
+            key = _credential_key(
+                self.host_account.caller_arn, build_assume_role_args(session_info)
+            )
+            self.assume_role_failures.pop(key, None)
+        session_info["Attempts"] = session_info.get("Attempts", 1) + 1
+        session_info["AssumeRoleSuccess"] = False
+        session_info["ExceptionDetails"] = None
+        session_info["Result"] = None
+
+    def _handle_exception(
+        self, cove_session: CoveSession, e: Exception
+    ) -> CoveSessionInformation:
+        record = cove_session.format_cove_error(e)
+        # Raised only once the session is out of attempts
+        if self.raise_exception is True and not self._should_retry(record):
+            logger.exception(record)
+            raise e
+        return record
+
+
+def format_cove_output(output: CoveFunctionOutput) -> CoveOutput:
+    """Rewrites typed session information into untyped dicts without None values,
+    splitting failed role assumptions out of the exceptions."""
+
+    formatted = CoveOutput(
+        Results=[format_cove_record(r) for r in output["Results"]],
+        Exceptions=[
+            format_cove_record(e)
+            for e in output["Exceptions"]
+            if e["AssumeRoleSuccess"] is True
+        ],
+        FailedAssumeRole=[
+            format_cove_record(f)
+            for f in output["Exceptions"]
+            if f["AssumeRoleSuccess"] is False
+        ],
+    )
+    if "Concurrency" in output:
+        formatted["Concurrency"] = output["Concurrency"]
+    if "AbortReason" in output:
+        formatted["AbortReason"] = output["AbortReason"]
+    return formatted
 
 
-def _iterate_results_in_order_of_completion(
-    jobs: List["Future[CoveSessionInformation]"],
-) -> Iterable[CoveSessionInformation]:
-    for f in as_completed(jobs):
-        yield f.result()
+def format_cove_record(record: CoveSessionInformation) -> Dict[str, Any]:
+    return {k: v for k, v in record.items() if v is not None}
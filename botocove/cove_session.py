@@ -1,14 +1,105 @@
+import inspect
 import logging
-from typing import Any
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Tuple
 
+import boto3
+import botocore.session
 from boto3.session import Session
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, DataNotFoundError
+from botocore.loaders import Loader
 from mypy_boto3_sts.client import STSClient
 
+from botocove.cove_credentials import (
+    THROTTLING_ERROR_CODES,
+    CoveCredentialCache,
+    CredentialKey,
+)
+from botocove.cove_rate_limiter import CoveRateLimiter
 from botocove.cove_types import CoveSessionInformation
 
 logger = logging.getLogger(__name__)
 
+BOTO3_DATA_PATH = os.path.join(os.path.dirname(boto3.__file__), "data")
+
+# Data every client creation reads.
+SHARED_DATA_TYPES = ["endpoints", "partitions", "sdk-default-configuration", "_retry"]
+
+_CLIENT_SIGNATURE = inspect.signature(Session.client)
+_RESOURCE_SIGNATURE = inspect.signature(Session.resource)
+
+_loader_lock = threading.Lock()
+
+
+def create_shared_loader() -> Loader:
+    """Returns a botocore loader for every CoveSession in a run to share, so
+    service models are read and parsed once rather than once per session."""
+
+    loader: Loader = botocore.session.get_session().get_component("data_loader")
+    loader.search_paths.append(BOTO3_DATA_PATH)
+    return loader
+
+
+def prewarm_loader(loader: Loader, services: Iterable[str]) -> None:
+    """Loads and parses the models for the given services into a shared loader
+    before the fan-out starts, so worker threads don't all race to load the same
+    files at once."""
+
+    for type_name in SHARED_DATA_TYPES:
+        try:
+            loader.load_data(type_name)
+        except DataNotFoundError:
+            pass
+
+    for service in services:
+        # The loader caches on exact call arguments, so each model is loaded the
+        # way botocore's client creator and boto3's resource factory ask for it.
+        # Raises UnknownServiceError for a misspelt service before any work runs.
+        service_model = loader.load_service_model(
+            service, "service-2", api_version=None
+        )
+        api_version = service_model["metadata"]["apiVersion"]
+        _load_optional_model(loader, service, "endpoint-rule-set-1", api_version=None)
+        _load_optional_model(loader, service, "paginators-1", api_version)
+        _load_optional_model(loader, service, "waiters-2", api_version)
+        try:
+            resources_version = loader.determine_latest_version(service, "resources-1")
+        except DataNotFoundError:
+            continue
+        _load_optional_model(loader, service, "resources-1", resources_version)
+
+
+def _load_optional_model(
+    loader: Loader, service: str, type_name: str, *args: Any, **kwargs: Any
+) -> None:
+    try:
+        loader.load_service_model(service, type_name, *args, **kwargs)
+    except DataNotFoundError:
+        pass
+
+
+def build_assume_role_args(session_info: CoveSessionInformation) -> Dict[str, Any]:
+    role_arn = (
+        f"arn:{session_info['Partition']}:"
+        f"iam::{session_info['Id']}:role/"
+        f"{session_info['RoleName']}"
+    )
+
+    # This calling style avoids a ParamValidationError from botocore.
+    # Passing None is not allowed for the optional parameters.
+    return {
+        k: v
+        for k, v in [
+            ("RoleArn", role_arn),
+            ("RoleSessionName", session_info["RoleSessionName"]),
+            ("Policy", session_info["Policy"]),
+            ("PolicyArns", session_info["PolicyArns"]),
+            ("ExternalId", session_info["ExternalId"]),
+        ]
+        if v is not None
+    }
+
 
 class CoveSession(Session):
     """Enriches a boto3 Session with account data from Master account if run from
@@ -23,39 +114,142 @@ class CoveSession(Session):
     def __init__(
         self,
         session_info: CoveSessionInformation,
-        sts_client: STSClient,
+        sts_client: Optional[STSClient],
+        caller_arn: str = "",
+        credential_cache: Optional[CoveCredentialCache] = None,
+        loader: Optional[Loader] = None,
+        assume_role_failures: Optional[Dict[CredentialKey, Exception]] = None,
+        rate_limiter: Optional[CoveRateLimiter] = None,
     ) -> None:
         self.session_information = session_info
         self.sts_client = sts_client
+        self.caller_arn = caller_arn
+        self.credential_cache = credential_cache
+        self.assume_role_failures = assume_role_failures
+        self.rate_limiter = rate_limiter
+        self.throttle_count = 0
+        self.loader = loader
+        self._boto_session_args: Optional[Dict[str, Any]] = None
+        self.session_args: Dict[str, Any] = {}
+        self._init_lock = threading.Lock()
+        self._initializing_thread: Optional[int] = None
+        self._clients: Dict[Tuple[Any, ...], Any] = {}
+        self._resources: Dict[Tuple[Any, ...], Any] = {}
+        self._memo_lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes that don't exist yet. The boto3 Session
+        # internals are built on first use, e.g. the first client() call, rather
+        # than when the role is assumed.
+        if (
+            name.startswith("__")
+            or self.__dict__.get("_boto_session_args") is None
+            or self.__dict__.get("_initializing_thread") == threading.get_ident()
+        ):
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+
+        # Threads started by the wrapped function wait for one initialisation,
+        # while lookups made by that initialisation itself fail normally.
+        # The arguments are only cleared once it succeeds, so a failed attempt
+        # raises its own error again on the next access.
+        with self._init_lock:
+            init_session_args = self._boto_session_args
+            if init_session_args is not None:
+                self._initializing_thread = threading.get_ident()
+                try:
+                    self.initialize_boto_session(**init_session_args)
+                finally:
+                    self._initializing_thread = None
+                self._boto_session_args = None
+        return getattr(self, name)
 
     def __repr__(self) -> str:
         # Overwrite boto3's repr to avoid AttributeErrors
         return f"{self.__class__.__name__}(account_id={self.session_information['Id']})"
 
+    if not TYPE_CHECKING:
+        # Defined at runtime only, so type checkers keep boto3-stubs' typed
+        # per-service overloads of client() and resource().
+
+        def client(self, *args, **kwargs):
+            """Returns the same client for repeated calls with the same arguments
+            for the lifetime of the session. Pass the same Config object to reuse
+            a client created with one."""
+            return self._memoize(
+                self._clients, _CLIENT_SIGNATURE, super().client, args, kwargs
+            )
+
+        def resource(self, *args, **kwargs):
+            """Returns the same resource for repeated calls with the same
+            arguments for the lifetime of the session."""
+            return self._memoize(
+                self._resources, _RESOURCE_SIGNATURE, super().resource, args, kwargs
+            )
+
+    def _memoize(
+        self,
+        cache: Dict[Tuple[Any, ...], Any],
+        signature: inspect.Signature,
+        factory: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        bound_args = signature.bind(self, *args, **kwargs)
+        bound_args.apply_defaults()
+        key = tuple(bound_args.arguments.items())[1:]
+        try:
+            hash(key)
+        except TypeError:
+            return factory(*args, **kwargs)
+
+        with self._memo_lock:
+            if key in cache:
+                return cache[key]
+
+        # Built outside the lock: boto3's resource() calls client() on this same
+        # session, which would otherwise block on the lock held here.
+        created = factory(*args, **kwargs)
+        with self._memo_lock:
+            return cache.setdefault(key, created)
+
+    @classmethod
+    def from_session_args(
+        cls,
+        session_info: CoveSessionInformation,
+        session_args: Dict[str, Any],
+        loader: Optional[Loader] = None,
+    ) -> "CoveSession":
+        """Recreates a session activated elsewhere, such as in another process,
+        from the session_args it was activated with."""
+
+        cove_session = cls(session_info, sts_client=None, loader=loader)
+        cove_session.session_args = dict(session_args)
+        cove_session._boto_session_args = dict(session_args)
+        cove_session.session_information["AssumeRoleSuccess"] = True
+        return cove_session
+
     def activate_cove_session(self) -> "CoveSession":
-        role_arn = (
-            f"arn:{self.session_information['Partition']}:"
-            f"iam::{self.session_information['Id']}:role/"
-            f"{self.session_information['RoleName']}"
-        )
+        if self.sts_client is None:
+            raise ValueError("An sts_client is needed to activate a CoveSession")
 
         try:
-            logger.debug(f"Attempting to assume {role_arn}")
+            assume_role_args = build_assume_role_args(self.session_information)
+            logger.debug(f"Attempting to assume {assume_role_args['RoleArn']}")
 
-            # This calling style avoids a ParamValidationError from botocore.
-            # Passing None is not allowed for the optional parameters.
-            assume_role_args = {
-                k: v
-                for k, v in [
-                    ("RoleArn", role_arn),
-                    ("RoleSessionName", self.session_information["RoleSessionName"]),
-                    ("Policy", self.session_information["Policy"]),
-                    ("PolicyArns", self.session_information["PolicyArns"]),
-                    ("ExternalId", self.session_information["ExternalId"]),
-                ]
-                if v is not None
-            }
-            creds = self.sts_client.assume_role(**assume_role_args)["Credentials"]  # type: ignore[arg-type] # noqa E501
+            if self.credential_cache is not None:
+                creds = self.credential_cache.assume_role(
+                    self.sts_client,
+                    self.caller_arn,
+                    failures=self.assume_role_failures,
+                    rate_limiter=self.rate_limiter,
+                    **assume_role_args,
+                )
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                creds = self.sts_client.assume_role(**assume_role_args)["Credentials"]  # type: ignore[arg-type] # noqa E501
 
             init_session_args = {
                 k: v
@@ -68,7 +262,8 @@ class CoveSession(Session):
                 if v is not None
             }
 
-            self.initialize_boto_session(**init_session_args)
+            self.session_args = init_session_args
+            self._boto_session_args = dict(init_session_args)
             self.session_information["AssumeRoleSuccess"] = True
         except ClientError:
             logger.error(
@@ -81,7 +276,35 @@ class CoveSession(Session):
 
     def initialize_boto_session(self, *args: Any, **kwargs: Any) -> None:
         # Inherit from and initialize standard boto3 Session object
+        if self.loader is not None and "botocore_session" not in kwargs:
+            botocore_session = botocore.session.get_session()
+            botocore_session.register_component("data_loader", self.loader)
+            kwargs["botocore_session"] = botocore_session
         super().__init__(*args, **kwargs)
+        self.events.register("needs-retry", self._count_throttle)
+
+    def _count_throttle(
+        self, response: Optional[Tuple[Any, Dict[str, Any]]] = None, **kwargs: Any
+    ) -> None:
+        # Seen by every client of this session before botocore decides whether
+        # to retry a call. Only counts; the retry decision is left to botocore.
+        if response is None:
+            return
+        error_code = response[1].get("Error", {}).get("Code")
+        if error_code in THROTTLING_ERROR_CODES:
+            with self._memo_lock:
+                self.throttle_count += 1
+
+    def _setup_loader(self) -> None:
+        # Overrides a private boto3 method, called from Session.__init__, that
+        # appends boto3's data path to the loader on every Session init. That
+        # would grow a shared loader's search paths without bound. Checked
+        # against boto3 1.20, 1.26, 1.34 and 1.43, which all define it the same
+        # way; test_session.py fails if boto3 stops calling it.
+        self._loader = self._session.get_component("data_loader")
+        with _loader_lock:
+            if BOTO3_DATA_PATH not in self._loader.search_paths:
+                self._loader.search_paths.append(BOTO3_DATA_PATH)
 
     def format_cove_result(self, result: Any) -> CoveSessionInformation:
         self.session_information["Result"] = result
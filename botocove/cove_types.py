@@ -1,10 +1,11 @@
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, Dict, List, Optional, Set, TypedDict
 
 from mypy_boto3_organizations.literals import AccountStatusType
+from mypy_boto3_organizations.type_defs import AccountTypeDef
 from mypy_boto3_sts.type_defs import PolicyDescriptorTypeTypeDef
 
 
-class CoveSessionInformation(TypedDict):
+class _CoveSessionInformationRequired(TypedDict):
     Id: str
     RoleName: str
     AssumeRoleSuccess: bool
@@ -22,12 +23,50 @@ class CoveSessionInformation(TypedDict):
     Partition: Optional[str]
 
 
-class CoveFunctionOutput(TypedDict):
+class CoveSessionInformation(_CoveSessionInformationRequired, total=False):
+    # Only present when the run has a retry policy
+    Attempts: int
+
+
+class CoveConcurrencyStats(TypedDict):
+    Initial: int
+    Final: int
+    Peak: int
+    Throttles: int
+
+
+class _CoveFunctionOutputRequired(TypedDict):
     Results: List[CoveSessionInformation]
     Exceptions: List[CoveSessionInformation]
 
 
-class CoveOutput(TypedDict):
+class CoveFunctionOutput(_CoveFunctionOutputRequired, total=False):
+    Concurrency: CoveConcurrencyStats
+    AbortReason: str
+
+
+class _CoveOutputRequired(TypedDict):
     Results: List[Dict[str, Any]]
     Exceptions: List[Dict[str, Any]]
     FailedAssumeRole: List[Dict[str, Any]]
+
+
+class CoveOutput(_CoveOutputRequired, total=False):
+    # Only present when the run used adaptive concurrency
+    Concurrency: CoveConcurrencyStats
+    # Only present when an abort_on policy stopped the run early
+    AbortReason: str
+
+
+class CoveOrgSnapshot(TypedDict):
+    CreatedAt: float
+    Accounts: Dict[str, AccountTypeDef]
+    RootIds: List[str]
+    ChildOus: Dict[str, List[str]]
+    ChildAccounts: Dict[str, List[str]]
+    EnabledRegions: Dict[str, List[str]]
+
+
+class CoveOrgIndex(TypedDict):
+    DescendantAccounts: Dict[str, Set[str]]
+    AncestorOus: Dict[str, List[str]]
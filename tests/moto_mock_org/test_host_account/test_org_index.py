@@ -0,0 +1,77 @@
+from typing import List, Optional
+
+from botocore.client import BaseClient
+from pytest_mock import MockerFixture
+
+from botocove.cove_host_account import CoveHostAccount
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def _host_account(
+    target_ids: Optional[List[str]], ignore_ids: Optional[List[str]]
+) -> CoveHostAccount:
+    return CoveHostAccount(
+        target_ids=target_ids,
+        ignore_ids=ignore_ids,
+        rolename=None,
+        role_session_name=None,
+        policy=None,
+        policy_arns=None,
+        external_id=None,
+        assuming_session=None,
+        regions=None,
+        partition=None,
+        thread_workers=20,
+    )
+
+
+def test_target_and_ignored_ous_share_one_org_walk(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    spy = mocker.spy(BaseClient, "_make_api_call")
+
+    host_account = _host_account(
+        target_ids=[mock_small_org.new_org1, mock_small_org.new_org4],
+        ignore_ids=[mock_small_org.new_org2, mock_small_org.new_org3],
+    )
+
+    operations = [call.args[1] for call in spy.call_args_list]
+    # The root and four OUs are each listed once for OUs and once for accounts
+    assert operations.count("ListRoots") == 1
+    assert operations.count("ListChildren") == 2 * 5
+    assert host_account.target_accounts == set(mock_small_org.account_group_two)
+
+
+def test_org_index_maps_ous_and_accounts(mock_small_org: SmallOrg) -> None:
+    host_account = _host_account(target_ids=[mock_small_org.new_org1], ignore_ids=None)
+
+    assert host_account.org_index is not None
+    descendants = host_account.org_index["DescendantAccounts"]
+    ancestors = host_account.org_index["AncestorOus"]
+
+    assert descendants[mock_small_org.new_org1] == set(mock_small_org.account_group_one)
+    assert descendants[mock_small_org.new_org2] == set(mock_small_org.account_group_one)
+    assert descendants[mock_small_org.new_org4] == set(mock_small_org.account_group_two)
+    for account_id in mock_small_org.account_group_one:
+        assert ancestors[account_id] == [
+            mock_small_org.new_org3,
+            mock_small_org.new_org2,
+            mock_small_org.new_org1,
+        ]
+    for account_id in mock_small_org.account_group_two:
+        assert ancestors[account_id] == [mock_small_org.new_org4]
+
+
+def test_org_is_not_walked_without_ous(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    spy = mocker.spy(BaseClient, "_make_api_call")
+
+    host_account = _host_account(
+        target_ids=mock_small_org.all_accounts[:2], ignore_ids=None
+    )
+
+    operations = [call.args[1] for call in spy.call_args_list]
+    assert "ListRoots" not in operations
+    assert "ListChildren" not in operations
+    assert host_account.org_index is None
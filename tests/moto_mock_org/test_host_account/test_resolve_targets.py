@@ -1,3 +1,8 @@
+import threading
+from typing import List
+
+from pytest_mock import MockerFixture
+
 from botocove.cove_host_account import CoveHostAccount
 from tests.moto_mock_org.moto_models import LargeOrg, SmallOrg
 
@@ -178,3 +183,58 @@ def test_target_just_targets(mock_small_org: SmallOrg) -> None:
     account_ids = [acc_id["Id"] for acc_id in sessions]
 
     assert set(account_ids) == set(mock_small_org.all_accounts[0:2])
+
+
+def test_target_overlapping_ous(mock_small_org: SmallOrg) -> None:
+
+    host_account = CoveHostAccount(
+        target_ids=[mock_small_org.new_org1, mock_small_org.new_org2],
+        ignore_ids=None,
+        rolename=None,
+        role_session_name=None,
+        policy=None,
+        policy_arns=None,
+        external_id=None,
+        assuming_session=None,
+        regions=None,
+        partition=None,
+        thread_workers=20,
+    )
+    sessions = host_account.get_cove_sessions()
+    account_ids = [acc_id["Id"] for acc_id in sessions]
+
+    assert sorted(account_ids) == sorted(mock_small_org.account_group_one)
+
+
+def test_sibling_ous_are_listed_concurrently(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    siblings = [mock_small_org.new_org1, mock_small_org.new_org4]
+    # Sequential traversal would time out waiting for the other sibling
+    barrier = threading.Barrier(len(siblings), timeout=5)
+    list_child_ous = CoveHostAccount._list_child_ous
+
+    def wait_for_siblings(self: CoveHostAccount, parent_ou: str) -> List[str]:
+        if parent_ou in siblings:
+            barrier.wait()
+        return list_child_ous(self, parent_ou)
+
+    mocker.patch.object(CoveHostAccount, "_list_child_ous", wait_for_siblings)
+
+    host_account = CoveHostAccount(
+        target_ids=siblings,
+        ignore_ids=None,
+        rolename=None,
+        role_session_name=None,
+        policy=None,
+        policy_arns=None,
+        external_id=None,
+        assuming_session=None,
+        regions=None,
+        partition=None,
+        thread_workers=20,
+    )
+    sessions = host_account.get_cove_sessions()
+    account_ids = [acc_id["Id"] for acc_id in sessions]
+
+    assert set(account_ids) == set(mock_small_org.all_accounts)
@@ -0,0 +1,144 @@
+import logging
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from botocove import CoveAbortPolicy, CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+REGIONS = ["eu-west-1", "eu-west-2", "us-east-1", "us-east-2"]
+
+
+def test_consecutive_failures_abort_the_run(
+    mock_small_org: SmallOrg, caplog: pytest.LogCaptureFixture
+) -> None:
+    calls: List[str] = []
+
+    @cove(
+        abort_on=CoveAbortPolicy(consecutive=3),
+        thread_workers=1,
+        max_in_flight=1,
+        regions=REGIONS,
+    )
+    def broken(session: CoveSession) -> None:
+        calls.append(session.session_information["Id"])
+        raise ValueError("a bug")
+
+    with caplog.at_level(logging.WARNING):
+        output = broken()
+
+    assert len(calls) == 3
+    assert len(output["Exceptions"]) == 3
+    assert output["Results"] == []
+    assert "3 sessions in a row failed with ValueError: a bug" in output["AbortReason"]
+    total = len(REGIONS) * len(mock_small_org.all_accounts)
+    assert f"{total - 3} sessions were not run" in caplog.text
+
+
+def test_error_rate_aborts_the_run_after_min_samples(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(
+        abort_on=CoveAbortPolicy(error_rate=0.5, min_samples=4),
+        thread_workers=1,
+        max_in_flight=1,
+        regions=REGIONS,
+    )
+    def broken(session: CoveSession) -> None:
+        raise ValueError("a bug")
+
+    output = broken()
+
+    assert len(output["Exceptions"]) == 4
+    assert output["AbortReason"].startswith("4 of 4 sessions failed")
+
+
+def test_queued_sessions_are_cancelled_on_abort(mock_small_org: SmallOrg) -> None:
+    release = threading.Event()
+    calls: List[str] = []
+
+    @cove(
+        abort_on=CoveAbortPolicy(consecutive=1),
+        thread_workers=2,
+        max_in_flight=8,
+        regions=REGIONS,
+    )
+    def one_fails(session: CoveSession) -> None:
+        calls.append(session.session_information["Id"])
+        if len(calls) == 1:
+            raise ValueError("a bug")
+        # Hold the other worker until the first failure has been seen
+        release.wait(timeout=2)
+
+    try:
+        output = one_fails()
+    finally:
+        release.set()
+
+    completed = len(output["Results"]) + len(output["Exceptions"])
+    assert completed == len(calls)
+    assert completed < len(REGIONS) * len(mock_small_org.all_accounts)
+    assert "AbortReason" in output
+
+
+def test_failures_of_different_types_are_not_consecutive(
+    mock_small_org: SmallOrg,
+) -> None:
+    calls: List[int] = []
+    lock = threading.Lock()
+
+    @cove(
+        abort_on=CoveAbortPolicy(consecutive=2),
+        thread_workers=1,
+        max_in_flight=1,
+        regions=REGIONS,
+    )
+    def alternating(session: CoveSession) -> None:
+        with lock:
+            calls.append(1)
+            odd = len(calls) % 2
+        if odd:
+            raise ValueError("odd")
+        raise KeyError("even")
+
+    output = alternating()
+
+    assert "AbortReason" not in output
+    assert len(output["Exceptions"]) == len(REGIONS) * len(mock_small_org.all_accounts)
+
+
+def test_healthy_run_is_not_aborted(mock_small_org: SmallOrg) -> None:
+    @cove(abort_on=CoveAbortPolicy(error_rate=0.1, min_samples=1, consecutive=1))
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    output = do_nothing()
+
+    assert "AbortReason" not in output
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"error_rate": 0},
+        {"error_rate": 1.5},
+        {"error_rate": 0.5, "min_samples": 0},
+        {"consecutive": 0},
+        {"consecutive": True},
+    ],
+)
+def test_invalid_policy_raises_value_error(kwargs: Dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        CoveAbortPolicy(**kwargs)
+
+
+def test_invalid_abort_on_raises_type_error(mock_small_org: SmallOrg) -> None:
+    @cove(abort_on=0.5)  # type: ignore[arg-type]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(TypeError, match="abort_on must be a CoveAbortPolicy"):
+        do_nothing()
@@ -0,0 +1,128 @@
+from typing import Any, Dict, List
+
+import pytest
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+
+from botocove import CoveSession, cove_batch
+from tests.moto_mock_org.moto_models import SmallOrg
+
+REGIONS = ["eu-west-1", "us-east-1"]
+
+
+def account_id(session: CoveSession) -> str:
+    return session.session_information["Id"]
+
+
+def region(session: CoveSession) -> str:
+    return session.region_name
+
+
+def broken(session: CoveSession) -> None:
+    raise ValueError("a bug")
+
+
+def test_each_function_gets_its_own_output(mock_small_org: SmallOrg) -> None:
+    outputs = cove_batch([account_id, region], regions=REGIONS)()
+
+    assert list(outputs) == ["account_id", "region"]
+    total = len(REGIONS) * len(mock_small_org.all_accounts)
+    for output in outputs.values():
+        assert len(output["Results"]) == total
+        assert output["Exceptions"] == []
+        assert output["FailedAssumeRole"] == []
+    assert all(r["Result"] == r["Id"] for r in outputs["account_id"]["Results"])
+    assert all(r["Result"] == r["Region"] for r in outputs["region"]["Results"])
+
+
+def test_functions_share_one_session_and_role_assumption(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    spy = mocker.spy(BaseClient, "_make_api_call")
+    seen: Dict[str, List[int]] = {}
+
+    def first(session: CoveSession) -> None:
+        seen.setdefault(session.session_information["Id"], []).append(id(session))
+
+    def second(session: CoveSession) -> None:
+        seen[session.session_information["Id"]].append(id(session))
+
+    cove_batch([first, second])()
+
+    assume_role_calls = [c for c in spy.call_args_list if c.args[1] == "AssumeRole"]
+    assert len(assume_role_calls) == len(mock_small_org.all_accounts)
+    assert len(seen) == len(mock_small_org.all_accounts)
+    assert all(len(ids) == 2 and ids[0] == ids[1] for ids in seen.values())
+
+
+def test_one_function_failing_does_not_stop_the_others(
+    mock_small_org: SmallOrg,
+) -> None:
+    outputs = cove_batch([broken, account_id])()
+
+    assert outputs["broken"]["Results"] == []
+    assert len(outputs["broken"]["Exceptions"]) == len(mock_small_org.all_accounts)
+    for exception in outputs["broken"]["Exceptions"]:
+        assert isinstance(exception["ExceptionDetails"], ValueError)
+    assert len(outputs["account_id"]["Results"]) == len(mock_small_org.all_accounts)
+    assert outputs["account_id"]["Exceptions"] == []
+
+
+def test_raise_exception_stops_the_batch(mock_small_org: SmallOrg) -> None:
+    with pytest.raises(ValueError, match="a bug"):
+        cove_batch([account_id, broken], raise_exception=True)()
+
+
+def test_arguments_are_passed_to_every_function(mock_small_org: SmallOrg) -> None:
+    def prefix_id(session: CoveSession, prefix: str) -> str:
+        return prefix + session.session_information["Id"]
+
+    def prefix_region(session: CoveSession, prefix: str) -> str:
+        return prefix + session.region_name
+
+    outputs = cove_batch([prefix_id, prefix_region])("x-")
+
+    for output in outputs.values():
+        assert all(r["Result"].startswith("x-") for r in output["Results"])
+
+
+def test_failed_assume_role_is_reported_for_every_function(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    make_api_call = BaseClient._make_api_call  # type: ignore[attr-defined]
+
+    def deny_assume_role(
+        self: BaseClient, operation_name: str, api_params: Dict[str, Any]
+    ) -> Any:
+        if operation_name == "AssumeRole":
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "AssumeRole"
+            )
+        return make_api_call(self, operation_name, api_params)
+
+    mocker.patch.object(BaseClient, "_make_api_call", deny_assume_role)
+
+    outputs = cove_batch([account_id, region])()
+
+    for output in outputs.values():
+        assert output["Results"] == []
+        assert len(output["FailedAssumeRole"]) == len(mock_small_org.all_accounts)
+
+
+@pytest.mark.parametrize(
+    "functions,kwargs,error,match",
+    [
+        ([], {}, ValueError, "functions must have at least 1 element"),
+        (account_id, {}, TypeError, "functions must be a list of callables"),
+        (["account_id"], {}, TypeError, "functions must be callable"),
+        ([account_id, account_id], {}, ValueError, "functions must have distinct"),
+        ([account_id], {"stream": True}, ValueError, "stream can't be used"),
+        ([account_id], {"executor": "process"}, ValueError, "can't be used"),
+    ],
+)
+def test_invalid_batch_arguments_raise(
+    functions: Any, kwargs: Dict[str, Any], error: type, match: str
+) -> None:
+    with pytest.raises(error, match=match):
+        cove_batch(functions, **kwargs)
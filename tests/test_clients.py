@@ -0,0 +1,111 @@
+import os
+import threading
+from typing import Any, List
+
+import pytest
+from botocore.config import Config
+from botocore.exceptions import UnknownServiceError
+from botocore.loaders import JSONFileLoader
+from pytest_mock import MockerFixture
+
+from botocove import CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def test_client_is_reused_for_the_same_arguments(mock_small_org: SmallOrg) -> None:
+    @cove()
+    def compare_clients(session: CoveSession) -> bool:
+        return session.client("sts") is session.client(service_name="sts")
+
+    output = compare_clients()
+
+    assert output["Exceptions"] == []
+    assert all(result["Result"] is True for result in output["Results"])
+
+
+def test_client_is_not_reused_for_different_arguments(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove()
+    def compare_clients(session: CoveSession) -> bool:
+        config = Config(retries={"max_attempts": 10})
+        sts = session.client("sts")
+        return (
+            sts is not session.client("sts", region_name="us-east-1")
+            and sts is not session.client("sts", config=config)
+            and session.client("sts", config=config)
+            is session.client("sts", config=config)
+        )
+
+    output = compare_clients()
+
+    assert output["Exceptions"] == []
+    assert all(result["Result"] is True for result in output["Results"])
+
+
+def test_resource_is_reused_for_the_same_arguments(mock_small_org: SmallOrg) -> None:
+    @cove()
+    def compare_resources(session: CoveSession) -> bool:
+        return session.resource("ec2") is session.resource("ec2")
+
+    output = compare_resources()
+
+    assert output["Exceptions"] == []
+    assert all(result["Result"] is True for result in output["Results"])
+
+
+def test_declared_services_are_loaded_before_running(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    ec2_loads: List[threading.Thread] = []
+    load_file = JSONFileLoader.load_file
+
+    def record_ec2_loads(self: JSONFileLoader, file_path: str) -> Any:
+        if f"{os.sep}ec2{os.sep}" in file_path:
+            ec2_loads.append(threading.current_thread())
+        return load_file(self, file_path)
+
+    mocker.patch.object(JSONFileLoader, "load_file", record_ec2_loads)
+
+    @cove(services=["ec2"])
+    def create_client(session: CoveSession) -> None:
+        session.client("ec2")
+
+    output = create_client()
+
+    assert output["Exceptions"] == []
+    # The ec2 model files were read by the main thread before the fan-out, and
+    # every worker's client was built from the shared loader's cache.
+    assert ec2_loads
+    assert all(thread is threading.main_thread() for thread in ec2_loads)
+
+
+def test_unknown_declared_service_raises_before_running(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(services=["not-a-service"])
+    def do_nothing(session: CoveSession) -> None:
+        raise AssertionError("should not run")
+
+    with pytest.raises(UnknownServiceError):
+        do_nothing()
+
+
+def test_when_service_is_not_str_then_raises_type_error(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(services=["ec2", 2])  # type: ignore[list-item]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(TypeError, match=r"all services must be strings"):
+        do_nothing()
+
+
+def test_when_services_is_str_then_raises_type_error(mock_small_org: SmallOrg) -> None:
+    @cove(services="ec2")  # type: ignore[arg-type]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(TypeError, match=r"services must be a list of str\."):
+        do_nothing()
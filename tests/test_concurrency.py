@@ -0,0 +1,122 @@
+from typing import Any
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+from botocove import CoveSession, cove
+from botocove.cove_concurrency import CoveConcurrencyController
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def _emit_throttle(client: Any) -> None:
+    operation = client.meta.service_model.operation_model("GetCallerIdentity")
+    client.meta.events.emit(
+        "needs-retry.sts.GetCallerIdentity",
+        response=(
+            AWSResponse(
+                "https://sts.amazonaws.com", 400, {}, None  # type: ignore[arg-type]
+            ),
+            {"Error": {"Code": "Throttling", "Message": "Rate exceeded"}},
+        ),
+        attempts=1,
+        caught_exception=None,
+        request_dict={"context": {}},
+        endpoint=None,
+        operation=operation,
+    )
+
+
+def test_limit_grows_by_about_one_per_window_of_clean_completions() -> None:
+    controller = CoveConcurrencyController(initial=4, maximum=10)
+
+    for _ in range(5):
+        controller.observe(latency=1.0, throttles=0)
+
+    assert controller.limit == 5
+    assert controller.stats()["Peak"] == 5
+
+
+def test_limit_is_capped_at_maximum() -> None:
+    controller = CoveConcurrencyController(initial=4, maximum=5)
+
+    for _ in range(50):
+        controller.observe(latency=1.0, throttles=0)
+
+    assert controller.limit == 5
+
+
+def test_throttling_halves_the_limit_once_per_window() -> None:
+    controller = CoveConcurrencyController(initial=8, maximum=10)
+
+    controller.observe(latency=1.0, throttles=1)
+    assert controller.limit == 4
+
+    # The rest of the burst that was already in flight
+    for _ in range(3):
+        controller.observe(latency=1.0, throttles=1)
+    assert controller.limit == 4
+
+    controller.observe(latency=1.0, throttles=1)
+    assert controller.limit == 2
+    assert controller.stats()["Throttles"] == 5
+
+
+def test_rising_latency_reduces_the_limit() -> None:
+    controller = CoveConcurrencyController(initial=8, maximum=10)
+
+    controller.observe(latency=1.0, throttles=0)
+    for _ in range(20):
+        controller.observe(latency=10.0, throttles=0)
+
+    assert controller.limit < 8
+
+
+def test_adaptive_run_reports_concurrency(mock_small_org: SmallOrg) -> None:
+    @cove(adaptive_concurrency=True, thread_workers=8)
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    output = account_id()
+
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+    assert output["Concurrency"]["Initial"] == 2
+    assert output["Concurrency"]["Peak"] >= 2
+    assert output["Concurrency"]["Final"] <= 8
+    assert output["Concurrency"]["Throttles"] == 0
+
+
+def test_throttling_seen_by_sessions_reduces_concurrency(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(adaptive_concurrency=True, thread_workers=16)
+    def throttled(session: CoveSession) -> int:
+        _emit_throttle(session.client("sts"))
+        return session.throttle_count
+
+    output = throttled()
+
+    assert all(r["Result"] == 1 for r in output["Results"])
+    assert output["Concurrency"]["Initial"] == 4
+    assert output["Concurrency"]["Final"] < 4
+    assert output["Concurrency"]["Throttles"] == len(mock_small_org.all_accounts)
+
+
+def test_output_has_no_concurrency_when_not_adaptive(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove()
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    assert "Concurrency" not in do_nothing()
+
+
+def test_adaptive_concurrency_cant_be_used_with_max_in_flight(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(adaptive_concurrency=True, max_in_flight=4)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match="max_in_flight can't be used"):
+        do_nothing()
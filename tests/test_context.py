@@ -0,0 +1,96 @@
+import threading
+from typing import Any, List, Set
+
+import pytest
+from botocore.client import BaseClient
+from pytest_mock import MockerFixture
+
+from botocove import CoveContext, CoveCredentialCache, CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def _operations(spy_calls: List[Any]) -> List[str]:
+    return [call.args[1] for call in spy_calls]
+
+
+def test_context_skips_setup_on_later_calls(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    with CoveContext() as context:
+
+        @cove(context=context, target_ids=[mock_small_org.new_org1])
+        def account_id(session: CoveSession) -> str:
+            return session.session_information["Id"]
+
+        first = account_id()
+        spy = mocker.spy(BaseClient, "_make_api_call")
+        second = account_id()
+
+    operations = _operations(spy.call_args_list)
+    for operation in [
+        "GetCallerIdentity",
+        "ListAccounts",
+        "ListRoots",
+        "ListChildren",
+        "AssumeRole",
+    ]:
+        assert operation not in operations
+    assert {r["Result"] for r in first["Results"]} == {
+        r["Result"] for r in second["Results"]
+    }
+    assert second["Exceptions"] == []
+
+
+def test_context_runs_functions_on_its_worker_threads(
+    mock_small_org: SmallOrg,
+) -> None:
+    thread_names: Set[str] = set()
+
+    with CoveContext(thread_workers=2) as context:
+
+        @cove(context=context)
+        def record_thread(session: CoveSession) -> None:
+            thread_names.add(threading.current_thread().name)
+
+        record_thread()
+        record_thread()
+
+    assert 1 <= len(thread_names) <= 2
+    assert all(name.startswith("botocove") for name in thread_names)
+
+
+def test_context_can_be_shared_by_concurrent_calls(mock_small_org: SmallOrg) -> None:
+    outputs: List[Any] = []
+
+    with CoveContext() as context:
+
+        @cove(context=context)
+        def account_id(session: CoveSession) -> str:
+            return session.session_information["Id"]
+
+        threads = [
+            threading.Thread(target=lambda: outputs.append(account_id()))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(outputs) == 3
+    for output in outputs:
+        assert output["Exceptions"] == []
+        assert len(output["Results"]) == len(mock_small_org.all_accounts)
+
+
+def test_context_cant_be_combined_with_its_own_arguments(
+    mock_small_org: SmallOrg,
+) -> None:
+    with CoveContext() as context:
+
+        @cove(context=context, credential_cache=CoveCredentialCache())
+        def do_nothing(session: CoveSession) -> None:
+            pass
+
+        with pytest.raises(ValueError, match="credential_cache can't be used"):
+            do_nothing()
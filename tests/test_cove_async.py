@@ -0,0 +1,120 @@
+import asyncio
+import sys
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from botocove import CoveAsyncSession, cove_async
+from tests.moto_mock_org.moto_models import SmallOrg
+
+aiobotocore_endpoint = pytest.importorskip("aiobotocore.endpoint")
+
+
+@pytest.fixture(autouse=True)
+def operations(monkeypatch: MonkeyPatch) -> Iterator[List[str]]:
+    """Moto returns botocore's synchronous responses, which aiobotocore expects to
+    await. Reads their bodies directly and records each operation called.
+    aiobotocore converts each response twice, so responses are recorded once."""
+
+    called: List[str] = []
+    responses: Dict[int, Any] = {}
+
+    async def convert_to_response_dict(
+        http_response: Any, operation_model: Any
+    ) -> Dict[str, Any]:
+        if id(http_response) not in responses:
+            # Holding the response keeps its id unique for the test
+            responses[id(http_response)] = http_response
+            called.append(operation_model.name)
+        return {
+            "headers": http_response.headers,
+            "status_code": http_response.status_code,
+            "context": {"operation_name": operation_model.name},
+            "body": http_response.content,
+        }
+
+    monkeypatch.setattr(
+        aiobotocore_endpoint, "convert_to_response_dict", convert_to_response_dict
+    )
+    yield called
+
+
+def test_async_function_runs_in_every_account(mock_small_org: SmallOrg) -> None:
+    @cove_async
+    async def get_account_id(session: CoveAsyncSession) -> str:
+        async with session.create_client("sts") as sts:
+            response = await sts.get_caller_identity()
+        return str(response["Account"])
+
+    output = asyncio.run(get_account_id())
+
+    assert output["Exceptions"] == []
+    assert output["FailedAssumeRole"] == []
+    assert {r["Id"] for r in output["Results"]} == set(mock_small_org.all_accounts)
+    for result in output["Results"]:
+        assert result["Result"] == result["Id"]
+        assert result["Region"] == "eu-west-1"
+        assert result["AssumeRoleSuccess"] is True
+
+
+def test_async_role_is_assumed_once_per_account_across_regions(
+    mock_small_org: SmallOrg, operations: List[str]
+) -> None:
+    @cove_async(regions=["eu-west-1", "us-east-1"], max_concurrency=3)
+    async def get_region(session: CoveAsyncSession) -> Any:
+        return session.region_name
+
+    output = asyncio.run(get_region())
+
+    assert len(output["Results"]) == 2 * len(mock_small_org.all_accounts)
+    assert all(r["Result"] == r["Region"] for r in output["Results"])
+    assert operations.count("AssumeRole") == len(mock_small_org.all_accounts)
+
+
+def test_async_exceptions_are_collected(mock_small_org: SmallOrg) -> None:
+    @cove_async
+    async def fail(session: CoveAsyncSession) -> None:
+        raise Exception("oh no")
+
+    output = asyncio.run(fail())
+
+    assert output["Results"] == []
+    assert len(output["Exceptions"]) == len(mock_small_org.all_accounts)
+    assert all(
+        repr(e["ExceptionDetails"]) == repr(Exception("oh no"))
+        for e in output["Exceptions"]
+    )
+
+
+def test_async_exception_is_raised(mock_small_org: SmallOrg) -> None:
+    @cove_async(raise_exception=True)
+    async def fail(session: CoveAsyncSession) -> None:
+        raise Exception("oh no")
+
+    with pytest.raises(Exception, match="oh no"):
+        asyncio.run(fail())
+
+
+def test_when_max_concurrency_is_not_positive_then_raises_value_error(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove_async(max_concurrency=0)
+    async def do_nothing(session: CoveAsyncSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match=r"max_concurrency must be a positive int"):
+        asyncio.run(do_nothing())
+
+
+def test_when_aiobotocore_is_missing_then_raises_import_error(
+    mock_small_org: SmallOrg, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setitem(sys.modules, "aiobotocore", None)
+
+    @cove_async
+    async def do_nothing(session: CoveAsyncSession) -> None:
+        pass
+
+    with pytest.raises(ImportError, match=r"pip install botocove\[async\]"):
+        asyncio.run(do_nothing())
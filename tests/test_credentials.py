@@ -0,0 +1,243 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, cast
+
+import pytest
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from mypy_boto3_sts.client import STSClient
+from mypy_boto3_sts.type_defs import CredentialsTypeDef
+from pytest_mock import MockerFixture
+
+from botocove import CoveCredentialCache, CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def _count_assume_role_calls(spy_calls: List[Any]) -> int:
+    return sum(1 for call in spy_calls if call.args[1] == "AssumeRole")
+
+
+def test_role_is_assumed_once_per_account_across_regions(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    spy = mocker.spy(BaseClient, "_make_api_call")
+
+    @cove(regions=["eu-west-1", "eu-central-1", "us-east-1"])
+    def get_region(session: CoveSession) -> str:
+        return session.region_name
+
+    output = get_region()
+
+    assert len(output["Results"]) == 3 * len(mock_small_org.all_accounts)
+    assert _count_assume_role_calls(spy.call_args_list) == len(
+        mock_small_org.all_accounts
+    )
+    for result in output["Results"]:
+        assert result["Result"] == result["Region"]
+
+
+def test_failed_assume_role_is_not_retried_within_a_run(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    make_api_call = BaseClient._make_api_call  # type: ignore[attr-defined]
+    assume_role_calls: List[str] = []
+
+    def deny_assume_role(
+        self: BaseClient, operation_name: str, api_params: Dict[str, Any]
+    ) -> Any:
+        if operation_name == "AssumeRole":
+            assume_role_calls.append(api_params["RoleArn"])
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "AssumeRole"
+            )
+        return make_api_call(self, operation_name, api_params)
+
+    mocker.patch.object(BaseClient, "_make_api_call", deny_assume_role)
+
+    @cove(regions=["eu-west-1", "eu-central-1", "us-east-1"])
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    output = do_nothing()
+
+    assert len(output["FailedAssumeRole"]) == 3 * len(mock_small_org.all_accounts)
+    assert len(assume_role_calls) == len(mock_small_org.all_accounts)
+
+
+def test_credentials_are_not_shared_between_invocations_by_default(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    @cove()
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+    spy = mocker.spy(BaseClient, "_make_api_call")
+    do_nothing()
+
+    assert _count_assume_role_calls(spy.call_args_list) == len(
+        mock_small_org.all_accounts
+    )
+
+
+def test_credentials_are_reused_across_invocations_sharing_a_cache(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    @cove(credential_cache=CoveCredentialCache())
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+    spy = mocker.spy(BaseClient, "_make_api_call")
+    output = do_nothing()
+
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+    assert _count_assume_role_calls(spy.call_args_list) == 0
+
+
+def test_cove_writes_credentials_to_cache_file(
+    mock_small_org: SmallOrg, tmp_path: Path
+) -> None:
+    path = tmp_path / "credentials.json"
+
+    @cove(credential_cache=CoveCredentialCache(path=str(path)))
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+
+    entries = json.loads(path.read_text())
+    assert len(entries) == len(mock_small_org.all_accounts)
+
+
+class _FakeSTSClient:
+    def __init__(self, lifetime: timedelta) -> None:
+        self.lifetime = lifetime
+        self.calls = 0
+
+    def assume_role(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls += 1
+        return {
+            "Credentials": {
+                "AccessKeyId": f"key-{self.calls}",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": datetime.now(timezone.utc) + self.lifetime,
+            }
+        }
+
+
+def _assume(
+    cache: CoveCredentialCache,
+    sts: _FakeSTSClient,
+    account_id: str,
+    caller_arn: str = "arn:aws:iam::123456789012:user/cove",
+    **kwargs: Any,
+) -> CredentialsTypeDef:
+    return cache.assume_role(
+        cast(STSClient, sts),
+        caller_arn,
+        RoleArn=f"arn:aws:iam::{account_id}:role/OrganizationAccountAccessRole",
+        **kwargs,
+    )
+
+
+def test_cache_refreshes_credentials_close_to_expiry() -> None:
+    sts = _FakeSTSClient(lifetime=timedelta(minutes=2))
+    cache = CoveCredentialCache(refresh_seconds=300)
+
+    first = _assume(cache, sts, "111111111111")
+    second = _assume(cache, sts, "111111111111")
+
+    assert sts.calls == 2
+    assert first["AccessKeyId"] != second["AccessKeyId"]
+
+
+def test_cache_keys_on_session_policy() -> None:
+    sts = _FakeSTSClient(lifetime=timedelta(hours=1))
+    cache = CoveCredentialCache()
+
+    _assume(cache, sts, "111111111111")
+    _assume(cache, sts, "111111111111", Policy="{}")
+    _assume(cache, sts, "111111111111")
+
+    assert sts.calls == 2
+
+
+def test_cache_keys_on_assuming_identity() -> None:
+    sts = _FakeSTSClient(lifetime=timedelta(hours=1))
+    cache = CoveCredentialCache()
+
+    first = _assume(cache, sts, "111111111111", "arn:aws:iam::123456789012:user/a")
+    second = _assume(cache, sts, "111111111111", "arn:aws:iam::210987654321:user/b")
+
+    assert sts.calls == 2
+    assert first["AccessKeyId"] != second["AccessKeyId"]
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    sts = _FakeSTSClient(lifetime=timedelta(hours=1))
+    cache = CoveCredentialCache(max_size=2)
+
+    for account_id in ["111111111111", "222222222222", "111111111111"]:
+        _assume(cache, sts, account_id)
+    _assume(cache, sts, "333333333333")
+    assert len(cache) == 2
+    assert sts.calls == 3
+
+    _assume(cache, sts, "111111111111")
+    assert sts.calls == 3
+    _assume(cache, sts, "222222222222")
+    assert sts.calls == 4
+
+
+def test_cache_persists_credentials_to_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "credentials.json")
+    sts = _FakeSTSClient(lifetime=timedelta(hours=1))
+
+    cache = CoveCredentialCache(path=path)
+    creds = _assume(cache, sts, "111111111111")
+    cache.save()
+
+    reloaded = CoveCredentialCache(path=path)
+    reloaded_creds = _assume(reloaded, sts, "111111111111")
+
+    assert sts.calls == 1
+    assert reloaded_creds == creds
+    assert os.stat(path).st_mode & 0o077 == 0
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        "not json",
+        json.dumps({"Key": []}),
+        json.dumps([{"Key": ["a"]}]),
+        json.dumps([{"Credentials": {}}]),
+        json.dumps([{"Key": ["a"], "Credentials": {"AccessKeyId": "a"}}]),
+    ],
+)
+def test_cache_ignores_malformed_file(tmp_path: Path, contents: str) -> None:
+    path = tmp_path / "credentials.json"
+    path.write_text(contents)
+
+    cache = CoveCredentialCache(path=str(path))
+
+    assert len(cache) == 0
+
+
+def test_cove_writes_credentials_to_cache_file_when_raising(
+    mock_small_org: SmallOrg, tmp_path: Path
+) -> None:
+    path = tmp_path / "credentials.json"
+
+    @cove(credential_cache=CoveCredentialCache(path=str(path)), raise_exception=True)
+    def fail(session: CoveSession) -> None:
+        raise Exception("oh no")
+
+    with pytest.raises(Exception, match="oh no"):
+        fail()
+
+    assert json.loads(path.read_text())
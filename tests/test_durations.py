@@ -0,0 +1,131 @@
+import json
+import os
+from typing import List
+
+import pytest
+
+from botocove import CoveDurationStats, CoveSession, cove
+from botocove.cove_durations import function_name
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def account_id(session: CoveSession) -> str:
+    return session.session_information["Id"]
+
+
+FUNCTION = function_name(account_id)
+
+
+def test_durations_are_recorded_for_each_session(mock_small_org: SmallOrg) -> None:
+    stats = CoveDurationStats()
+
+    output = cove(account_id, duration_stats=stats, regions=["eu-west-1"])()
+
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+    assert len(stats) == len(mock_small_org.all_accounts)
+    for account in mock_small_org.all_accounts:
+        seconds = stats.expected(FUNCTION, account, "eu-west-1")
+        assert seconds is not None and seconds >= 0
+
+
+def test_failed_sessions_are_not_recorded(mock_small_org: SmallOrg) -> None:
+    stats = CoveDurationStats()
+
+    @cove(duration_stats=stats)
+    def broken(session: CoveSession) -> None:
+        raise ValueError("a bug")
+
+    broken()
+
+    assert len(stats) == 0
+
+
+def test_longest_expected_sessions_run_first(mock_small_org: SmallOrg) -> None:
+    slowest, slower = mock_small_org.all_accounts[2:4]
+    started: List[str] = []
+
+    def record_order(session: CoveSession) -> None:
+        started.append(session.session_information["Id"])
+
+    stats = CoveDurationStats()
+    for account in mock_small_org.all_accounts:
+        stats.record(function_name(record_order), account, "eu-west-1", 1)
+    stats.record(function_name(record_order), slower, "eu-west-1", 99)
+    stats.record(function_name(record_order), slowest, "eu-west-1", 199)
+
+    cove(
+        record_order,
+        duration_stats=stats,
+        thread_workers=1,
+        max_in_flight=1,
+        regions=["eu-west-1"],
+    )()
+
+    assert started[:2] == [slowest, slower]
+    assert len(started) == len(mock_small_org.all_accounts)
+
+
+def test_unrecorded_sessions_are_expected_to_take_the_median() -> None:
+    stats = CoveDurationStats()
+    for account, seconds in [("fast", 1), ("medium", 5), ("slow", 9)]:
+        stats.record("f", account, None, seconds)
+    sessions = [
+        {"Id": account, "Region": None} for account in ["fast", "new", "slow", "medium"]
+    ]
+
+    ordered = stats.longest_first("f", sessions)  # type: ignore[arg-type]
+
+    # The new account ties with medium and keeps its place ahead of it
+    assert [s["Id"] for s in ordered] == ["slow", "new", "medium", "fast"]
+
+
+def test_durations_are_smoothed_between_runs() -> None:
+    stats = CoveDurationStats()
+
+    stats.record("f", "111111111111", "eu-west-1", 10)
+    stats.record("f", "111111111111", "eu-west-1", 20)
+
+    assert stats.expected("f", "111111111111", "eu-west-1") == 15
+
+
+def test_durations_persist_to_and_merge_with_a_file(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "durations.json")
+    first = CoveDurationStats(path=path)
+    first.record("f", "111111111111", None, 3)
+    first.save()
+    second = CoveDurationStats(path=path)
+    second.record("g", "222222222222", "eu-west-1", 4)
+    second.save()
+
+    reloaded = CoveDurationStats(path=path)
+
+    assert reloaded.expected("f", "111111111111", None) == 3
+    assert reloaded.expected("g", "222222222222", "eu-west-1") == 4
+
+
+def test_malformed_file_is_ignored(
+    tmp_path: str, caplog: pytest.LogCaptureFixture
+) -> None:
+    path = os.path.join(tmp_path, "durations.json")
+    with open(path, "w") as f:
+        json.dump([{"Function": "f", "Id": "111111111111"}], f)
+
+    stats = CoveDurationStats(path=path)
+
+    assert len(stats) == 0
+    assert "malformed entry" in caplog.text
+
+
+def test_invalid_duration_stats_raises_type_error(mock_small_org: SmallOrg) -> None:
+    with pytest.raises(TypeError, match="duration_stats must be a CoveDurationStats"):
+        cove(account_id, duration_stats="durations.json")()  # type: ignore[arg-type]
+
+
+def test_callable_objects_are_named_by_their_type() -> None:
+    class Audit(object):
+        def __call__(self, session: CoveSession) -> None:
+            pass
+
+    assert function_name(Audit()).endswith(
+        "test_callable_objects_are_named_by_their_type.<locals>.Audit"
+    )
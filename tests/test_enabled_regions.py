@@ -0,0 +1,136 @@
+import os
+from typing import Any, Dict, List
+
+import pytest
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+
+from botocove import CoveOrgCache, CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+DEFAULT_REGIONS = ["eu-west-1", "us-east-1"]
+
+
+def account_and_region(session: CoveSession) -> str:
+    return f"{session.session_information['Id']}:{session.region_name}"
+
+
+def _mock_list_regions(
+    mocker: MockerFixture, opted_in: Dict[str, List[str]]
+) -> List[str]:
+    """Answers ListRegions, which moto doesn't implement, with the default
+    regions plus each account's opted in regions. Returns the accounts looked
+    up."""
+
+    make_api_call = BaseClient._make_api_call  # type: ignore[attr-defined]
+    looked_up: List[str] = []
+
+    def list_regions(
+        self: BaseClient, operation_name: str, api_params: Dict[str, Any]
+    ) -> Any:
+        if operation_name != "ListRegions":
+            return make_api_call(self, operation_name, api_params)
+        account_id = api_params["AccountId"]
+        looked_up.append(account_id)
+        assert api_params["RegionOptStatusContains"] == [
+            "ENABLED",
+            "ENABLED_BY_DEFAULT",
+        ]
+        regions = DEFAULT_REGIONS + opted_in.get(account_id, [])
+        return {
+            "Regions": [
+                {"RegionName": region, "RegionOptStatus": "ENABLED"}
+                for region in regions
+            ]
+        }
+
+    mocker.patch.object(BaseClient, "_make_api_call", list_regions)
+    return looked_up
+
+
+def test_runs_only_in_each_accounts_enabled_regions(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    opted_in_account = mock_small_org.all_accounts[0]
+    _mock_list_regions(mocker, {opted_in_account: ["af-south-1"]})
+
+    output = cove(account_and_region, regions="enabled")()
+
+    expected = {
+        f"{account_id}:{region}"
+        for account_id in mock_small_org.all_accounts
+        for region in DEFAULT_REGIONS
+    }
+    expected.add(f"{opted_in_account}:af-south-1")
+    assert {r["Result"] for r in output["Results"]} == expected
+    assert len(output["Results"]) == len(expected)
+    assert output["Exceptions"] == []
+
+
+def test_enabled_regions_are_reused_from_the_org_cache(
+    mock_small_org: SmallOrg, mocker: MockerFixture, tmp_path: str
+) -> None:
+    looked_up = _mock_list_regions(mocker, {})
+    path = os.path.join(tmp_path, "org.json")
+
+    cove(account_and_region, regions="enabled", org_cache=CoveOrgCache(path=path))()
+    first_lookups = list(looked_up)
+    looked_up.clear()
+    output = cove(
+        account_and_region, regions="enabled", org_cache=CoveOrgCache(path=path)
+    )()
+
+    assert sorted(first_lookups) == sorted(mock_small_org.all_accounts)
+    assert looked_up == []
+    assert len(output["Results"]) == len(DEFAULT_REGIONS) * len(
+        mock_small_org.all_accounts
+    )
+
+
+def test_enabled_regions_are_looked_up_again_once_expired(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    looked_up = _mock_list_regions(mocker, {})
+    org_cache = CoveOrgCache(ttl_seconds=0)
+
+    cove(account_and_region, regions="enabled", org_cache=org_cache)()
+    cove(account_and_region, regions="enabled", org_cache=org_cache)()
+
+    assert len(looked_up) == 2 * len(mock_small_org.all_accounts)
+
+
+def test_account_scope_runs_once_in_an_enabled_region(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    _mock_list_regions(mocker, {})
+
+    output = cove(account_and_region, regions="enabled", scope="account")()
+
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+    assert all(r["Region"] in DEFAULT_REGIONS for r in output["Results"])
+
+
+def test_list_regions_denied_is_raised(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    make_api_call = BaseClient._make_api_call  # type: ignore[attr-defined]
+
+    def deny_list_regions(
+        self: BaseClient, operation_name: str, api_params: Dict[str, Any]
+    ) -> Any:
+        if operation_name == "ListRegions":
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "ListRegions"
+            )
+        return make_api_call(self, operation_name, api_params)
+
+    mocker.patch.object(BaseClient, "_make_api_call", deny_list_regions)
+
+    with pytest.raises(ClientError, match="AccessDenied"):
+        cove(account_and_region, regions="enabled")()
+
+
+def test_other_region_strings_raise_type_error(mock_small_org: SmallOrg) -> None:
+    with pytest.raises(TypeError, match="regions must be a list of str"):
+        cove(account_and_region, regions="all")()
@@ -0,0 +1,150 @@
+import json
+import os
+import stat
+from typing import Any, Dict, Generator, List
+
+import pytest
+
+from botocove import CoveSession, cove
+from botocove.cove_journal import CoveJournal, JournalledException
+from tests.moto_mock_org.moto_models import SmallOrg
+
+REGIONS = ["eu-west-1", "us-east-1"]
+
+
+def _read_lines(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_each_finished_session_is_journalled(
+    mock_small_org: SmallOrg, tmp_path: str
+) -> None:
+    path = os.path.join(tmp_path, "journal.jsonl")
+
+    @cove(journal=path, regions=REGIONS)
+    def account_id(session: CoveSession) -> Dict[str, str]:
+        return {"Id": session.session_information["Id"]}
+
+    account_id()
+
+    lines = _read_lines(path)
+    assert len(lines) == len(REGIONS) * len(mock_small_org.all_accounts)
+    assert {(line["Id"], line["Region"]) for line in lines} == {
+        (account, region)
+        for account in mock_small_org.all_accounts
+        for region in REGIONS
+    }
+    assert all(line["Result"] == {"Id": line["Id"]} for line in lines)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_resume_runs_only_unfinished_sessions(
+    mock_small_org: SmallOrg, tmp_path: str
+) -> None:
+    path = os.path.join(tmp_path, "journal.jsonl")
+    total = len(REGIONS) * len(mock_small_org.all_accounts)
+    calls: List[str] = []
+
+    def account_id(session: CoveSession) -> str:
+        calls.append(session.session_information["Id"])
+        return session.session_information["Id"]
+
+    # Interrupt a streamed run after three sessions have finished
+    interrupted: Generator[Dict[str, Any], None, None] = cove(
+        account_id, journal=path, stream=True, thread_workers=1, regions=REGIONS
+    )()
+    for _ in range(3):
+        next(interrupted)
+    interrupted.close()
+    journalled = len(_read_lines(path))
+    calls.clear()
+
+    output = cove(account_id, journal=path, resume=True, regions=REGIONS)()
+
+    assert journalled == 3
+    assert len(calls) == total - 3
+    assert len(output["Results"]) == total
+    assert {(r["Id"], r["Region"]) for r in output["Results"]} == {
+        (account, region)
+        for account in mock_small_org.all_accounts
+        for region in REGIONS
+    }
+    assert len(_read_lines(path)) == total
+
+
+def test_resumed_exceptions_keep_their_type_and_message(
+    mock_small_org: SmallOrg, tmp_path: str
+) -> None:
+    path = os.path.join(tmp_path, "journal.jsonl")
+    calls: List[str] = []
+
+    def broken(session: CoveSession) -> None:
+        calls.append(session.session_information["Id"])
+        raise ValueError("a bug")
+
+    cove(broken, journal=path)()
+    calls.clear()
+    resumed = cove(broken, journal=path, resume=True)()
+
+    assert calls == []
+    assert resumed["Results"] == []
+    assert len(resumed["Exceptions"]) == len(mock_small_org.all_accounts)
+    for exception in resumed["Exceptions"]:
+        error = exception["ExceptionDetails"]
+        assert isinstance(error, JournalledException)
+        assert error.exception_type == "ValueError"
+        assert str(error) == "a bug"
+
+
+def test_journal_is_started_afresh_without_resume(
+    mock_small_org: SmallOrg, tmp_path: str
+) -> None:
+    path = os.path.join(tmp_path, "journal.jsonl")
+
+    @cove(journal=path)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+    do_nothing()
+
+    assert len(_read_lines(path)) == len(mock_small_org.all_accounts)
+
+
+def test_line_cut_short_is_skipped_and_not_appended_to(
+    tmp_path: str, caplog: pytest.LogCaptureFixture
+) -> None:
+    path = os.path.join(tmp_path, "journal.jsonl")
+    record = {
+        "Id": "111111111111",
+        "RoleName": "OrganizationAccountAccessRole",
+        "AssumeRoleSuccess": True,
+        "Region": "eu-west-1",
+        "Result": 1,
+    }
+    with open(path, "w") as f:
+        f.write(json.dumps(record) + "\n" + json.dumps(record)[:20])
+
+    journal = CoveJournal(path)
+    before = journal.read()
+    journal.open(resume=True)
+    journal.append(before[("111111111111", "eu-west-1")])
+    journal.close()
+
+    assert list(before) == [("111111111111", "eu-west-1")]
+    assert "malformed line" in caplog.text
+    assert len(CoveJournal(path).read()) == 1
+    with open(path) as f:
+        assert len(f.read().splitlines()) == 3
+
+
+def test_resume_without_a_journal_raises_value_error(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(resume=True)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match="resume needs a journal"):
+        do_nothing()
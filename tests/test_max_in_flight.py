@@ -0,0 +1,62 @@
+from typing import Iterator, List
+
+import pytest
+from pytest_mock import MockerFixture
+
+from botocove import CoveSession, cove
+from botocove.cove_host_account import CoveHostAccount
+from botocove.cove_types import CoveSessionInformation
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def test_sessions_are_drawn_no_further_ahead_than_the_window(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    drawn: List[str] = []
+    generate_sessions = CoveHostAccount._generate_account_sessions
+
+    def counting_generator(
+        self: CoveHostAccount,
+    ) -> Iterator[CoveSessionInformation]:
+        for session_info in generate_sessions(self):
+            drawn.append(session_info["Id"])
+            yield session_info
+
+    mocker.patch.object(
+        CoveHostAccount, "_generate_account_sessions", counting_generator
+    )
+    drawn_at_call: List[int] = []
+
+    @cove(thread_workers=1, max_in_flight=2, regions=["eu-west-1", "us-east-1"])
+    def record_drawn(session: CoveSession) -> None:
+        drawn_at_call.append(len(drawn))
+
+    output = record_drawn()
+
+    assert len(output["Results"]) == 2 * len(mock_small_org.all_accounts)
+    assert len(drawn) == 2 * len(mock_small_org.all_accounts)
+    for call, drawn_count in enumerate(drawn_at_call):
+        assert drawn_count <= call + 2
+
+
+def test_window_of_one_runs_every_session(mock_small_org: SmallOrg) -> None:
+    @cove(max_in_flight=1, regions=["eu-west-1", "us-east-1"])
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    output = account_id()
+
+    assert output["Exceptions"] == []
+    assert len(output["Results"]) == 2 * len(mock_small_org.all_accounts)
+
+
+@pytest.mark.parametrize("max_in_flight", [0, -1, "5"])
+def test_invalid_max_in_flight_raises_value_error(
+    mock_small_org: SmallOrg, max_in_flight: object
+) -> None:
+    @cove(max_in_flight=max_in_flight)  # type: ignore[arg-type]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match="max_in_flight must be a positive int"):
+        do_nothing()
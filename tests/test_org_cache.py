@@ -0,0 +1,114 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from botocore.client import BaseClient
+from pytest_mock import MockerFixture
+
+from botocove import CoveOrgCache, CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+ORG_DISCOVERY_OPERATIONS = {"ListAccounts", "ListChildren"}
+
+
+def _count_discovery_calls(spy_calls: List[Any]) -> int:
+    return sum(1 for call in spy_calls if call.args[1] in ORG_DISCOVERY_OPERATIONS)
+
+
+def test_org_is_discovered_on_every_call_by_default(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    @cove(target_ids=[mock_small_org.new_org1])
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+    spy = mocker.spy(BaseClient, "_make_api_call")
+    do_nothing()
+
+    assert _count_discovery_calls(spy.call_args_list) > 0
+
+
+def test_org_snapshot_is_reused_across_calls_sharing_a_cache(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    @cove(target_ids=[mock_small_org.new_org1], org_cache=CoveOrgCache())
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    first = account_id()
+    spy = mocker.spy(BaseClient, "_make_api_call")
+    second = account_id()
+
+    assert _count_discovery_calls(spy.call_args_list) == 0
+    assert {r["Result"] for r in first["Results"]} == {
+        r["Result"] for r in second["Results"]
+    }
+    assert all("Email" in r for r in second["Results"])
+
+
+def test_expired_org_snapshot_is_discovered_again(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    @cove(org_cache=CoveOrgCache(ttl_seconds=0))
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+    spy = mocker.spy(BaseClient, "_make_api_call")
+    do_nothing()
+
+    assert _count_discovery_calls(spy.call_args_list) == 1
+
+
+def test_org_snapshot_persists_to_file(
+    mock_small_org: SmallOrg, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    path = str(tmp_path / "org.json")
+
+    @cove(target_ids=[mock_small_org.new_org1], org_cache=CoveOrgCache(path=path))
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+
+    reloaded = CoveOrgCache(path=path)
+    spy = mocker.spy(BaseClient, "_make_api_call")
+
+    @cove(target_ids=[mock_small_org.new_org1], org_cache=reloaded)
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    output = account_id()
+
+    assert _count_discovery_calls(spy.call_args_list) == 0
+    assert {r["Result"] for r in output["Results"]} == set(
+        mock_small_org.account_group_one
+    )
+    assert os.stat(path).st_mode & 0o077 == 0
+
+    (snapshot,) = json.loads(Path(path).read_text()).values()
+    assert set(snapshot["Accounts"]) >= set(mock_small_org.all_accounts)
+    for account in snapshot["Accounts"].values():
+        datetime.fromisoformat(account["JoinedTimestamp"])
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        "not json",
+        json.dumps([]),
+        json.dumps({"aws:111111111111": {"CreatedAt": 0}}),
+        json.dumps({"aws:111111111111": {"Accounts": [], "CreatedAt": "x"}}),
+    ],
+)
+def test_org_cache_ignores_malformed_file(tmp_path: Path, contents: str) -> None:
+    path = tmp_path / "org.json"
+    path.write_text(contents)
+
+    cache = CoveOrgCache(path=str(path))
+
+    assert len(cache) == 0
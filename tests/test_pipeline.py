@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Any, Dict, List, Set
+
+import pytest
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+
+from botocove import CoveSession, cove
+from botocove.cove_rate_limiter import CoveRateLimiter
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def test_pipeline_runs_every_session(mock_small_org: SmallOrg) -> None:
+    function_threads: Set[str] = set()
+
+    @cove(
+        assume_role_workers=2,
+        thread_workers=3,
+        regions=["eu-west-1", "us-east-1"],
+    )
+    def account_id(session: CoveSession) -> str:
+        function_threads.add(threading.current_thread().name)
+        return session.session_information["Id"]
+
+    output = account_id()
+
+    assert output["Exceptions"] == []
+    assert len(output["Results"]) == 2 * len(mock_small_org.all_accounts)
+    assert all(r["Result"] == r["Id"] for r in output["Results"])
+    assert not any(name.startswith("botocove-assume-role") for name in function_threads)
+
+
+def test_pipeline_reports_failed_assume_roles(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    make_api_call = BaseClient._make_api_call  # type: ignore[attr-defined]
+
+    def deny_assume_role(
+        self: BaseClient, operation_name: str, api_params: Dict[str, Any]
+    ) -> Any:
+        if operation_name == "AssumeRole":
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "AssumeRole"
+            )
+        return make_api_call(self, operation_name, api_params)
+
+    mocker.patch.object(BaseClient, "_make_api_call", deny_assume_role)
+    called: List[str] = []
+
+    @cove(assume_role_workers=2)
+    def record_call(session: CoveSession) -> None:
+        called.append(session.session_information["Id"])
+
+    output = record_call()
+
+    assert called == []
+    assert len(output["FailedAssumeRole"]) == len(mock_small_org.all_accounts)
+
+
+def test_assume_role_rate_paces_sts_calls(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    acquire = mocker.spy(CoveRateLimiter, "acquire")
+
+    @cove(assume_role_workers=2, assume_role_rate=1000)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    output = do_nothing()
+
+    assert output["Exceptions"] == []
+    assert acquire.call_count == len(mock_small_org.all_accounts)
+
+
+def test_rate_limiter_paces_calls_after_burst() -> None:
+    limiter = CoveRateLimiter(rate=20, burst=2)
+
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    # Two calls in the burst, then four at 20 per second
+    assert elapsed >= 0.19
+
+
+@pytest.mark.parametrize(
+    "arguments,message",
+    [
+        ({"assume_role_workers": 0}, "assume_role_workers must be a positive int"),
+        ({"assume_role_rate": -1}, "assume_role_rate must be a positive number"),
+    ],
+)
+def test_invalid_pipeline_arguments_raise_value_error(
+    mock_small_org: SmallOrg, arguments: Dict[str, Any], message: str
+) -> None:
+    @cove(**arguments)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match=message):
+        do_nothing()
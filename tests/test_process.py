@@ -0,0 +1,63 @@
+import os
+from typing import Optional, Tuple
+
+import pytest
+
+from botocove import CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+@cove(executor="process")
+def process_details(session: CoveSession, suffix: str) -> Tuple[int, str, str]:
+    return os.getpid(), session.session_information["Id"] + suffix, session.region_name
+
+
+@cove(executor="process")
+def raise_in_process(session: CoveSession) -> None:
+    raise ValueError(f"oops in {session.session_information['Id']}")
+
+
+def test_function_runs_in_worker_processes(mock_small_org: SmallOrg) -> None:
+    output = process_details("-done")
+
+    assert output["Exceptions"] == []
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+    for record in output["Results"]:
+        pid, account, region = record["Result"]
+        assert pid != os.getpid()
+        assert account == record["Id"] + "-done"
+        assert region == record["Region"]
+        assert record["AssumeRoleSuccess"] is True
+
+
+def test_exceptions_in_worker_processes_are_reported(
+    mock_small_org: SmallOrg,
+) -> None:
+    output = raise_in_process()
+
+    assert output["Results"] == []
+    assert len(output["Exceptions"]) == len(mock_small_org.all_accounts)
+    for record in output["Exceptions"]:
+        assert isinstance(record["ExceptionDetails"], ValueError)
+        assert str(record["ExceptionDetails"]) == f"oops in {record['Id']}"
+
+
+def test_nested_function_raises_value_error(mock_small_org: SmallOrg) -> None:
+    @cove(executor="process")
+    def nested(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match="must be defined at the top level"):
+        nested()
+
+
+@pytest.mark.parametrize("executor", ["processes", None])
+def test_invalid_executor_raises_value_error(
+    mock_small_org: SmallOrg, executor: Optional[str]
+) -> None:
+    @cove(executor=executor)  # type: ignore[arg-type]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match="executor must be one of thread, process"):
+        do_nothing()
@@ -0,0 +1,105 @@
+from typing import Any, Dict, List
+
+import pytest
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+
+from botocove import CoveContext, CoveRateLimiter, CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+ORG_OPERATIONS = {"ListAccounts", "ListRoots", "ListChildren"}
+
+
+def test_org_rate_paces_organizations_calls(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    limiter = CoveRateLimiter(rate=1000)
+    acquire = mocker.spy(limiter, "acquire")
+    api_calls = mocker.spy(BaseClient, "_make_api_call")
+
+    @cove(org_rate=limiter, target_ids=[mock_small_org.new_org1])
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+    do_nothing()
+
+    org_calls = [c for c in api_calls.call_args_list if c.args[1] in ORG_OPERATIONS]
+    assert len(org_calls) > 0
+    assert acquire.call_count == len(org_calls)
+
+
+def test_rate_limiter_is_shared_between_calls(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    limiter = CoveRateLimiter(rate=1000)
+    acquire = mocker.spy(limiter, "acquire")
+
+    @cove(assume_role_rate=limiter)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    @cove(assume_role_rate=limiter, regions=["us-east-1"])
+    def do_nothing_elsewhere(session: CoveSession) -> None:
+        pass
+
+    do_nothing()
+    do_nothing_elsewhere()
+
+    assert acquire.call_count == 2 * len(mock_small_org.all_accounts)
+
+
+def test_throttled_assume_role_is_retried_for_other_regions(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    make_api_call = BaseClient._make_api_call  # type: ignore[attr-defined]
+    assume_role_calls: List[str] = []
+
+    def throttle_first_assume_role(
+        self: BaseClient, operation_name: str, api_params: Dict[str, Any]
+    ) -> Any:
+        if operation_name == "AssumeRole":
+            role_arn = api_params["RoleArn"]
+            assume_role_calls.append(role_arn)
+            if assume_role_calls.count(role_arn) == 1:
+                raise ClientError(
+                    {"Error": {"Code": "Throttling", "Message": "Rate exceeded"}},
+                    "AssumeRole",
+                )
+        return make_api_call(self, operation_name, api_params)
+
+    mocker.patch.object(BaseClient, "_make_api_call", throttle_first_assume_role)
+
+    @cove(regions=["eu-west-1", "us-east-1"])
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    output = do_nothing()
+
+    accounts = len(mock_small_org.all_accounts)
+    assert len(assume_role_calls) == 2 * accounts
+    assert len(output["FailedAssumeRole"]) == accounts
+    assert len(output["Results"]) == accounts
+
+
+def test_invalid_org_rate_raises_value_error(mock_small_org: SmallOrg) -> None:
+    @cove(org_rate=0)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(
+        ValueError, match="org_rate must be a positive number or a CoveRateLimiter"
+    ):
+        do_nothing()
+
+
+def test_org_rate_belongs_to_the_context(mock_small_org: SmallOrg) -> None:
+    with CoveContext() as context:
+
+        @cove(context=context, org_rate=10)
+        def do_nothing(session: CoveSession) -> None:
+            pass
+
+        with pytest.raises(ValueError, match="org_rate can't be used with context"):
+            do_nothing()
@@ -0,0 +1,79 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from botocove import CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def count_outcomes(counts: Dict[str, int], record: Dict[str, Any]) -> Dict[str, int]:
+    outcome = "Exceptions" if "ExceptionDetails" in record else "Results"
+    counts[outcome] += 1
+    return counts
+
+
+def test_reducer_returns_the_aggregate(mock_small_org: SmallOrg) -> None:
+    @cove(reducer=count_outcomes, reducer_initial={"Results": 0, "Exceptions": 0})
+    def fail_in_one_account(session: CoveSession) -> None:
+        if session.session_information["Id"] == mock_small_org.all_accounts[0]:
+            raise ValueError("oops")
+
+    aggregate = fail_in_one_account()
+
+    assert aggregate == {
+        "Results": len(mock_small_org.all_accounts) - 1,
+        "Exceptions": 1,
+    }
+
+
+def test_reducer_receives_formatted_records(mock_small_org: SmallOrg) -> None:
+    def collect(records: List[Dict[str, Any]], record: Dict[str, Any]) -> Any:
+        return records + [record]
+
+    @cove(reducer=collect, reducer_initial=[])
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    records = account_id()
+
+    assert len(records) == len(mock_small_org.all_accounts)
+    assert all(record["Result"] == record["Id"] for record in records)
+    assert all(None not in record.values() for record in records)
+
+
+def test_reducer_initial_is_not_shared_between_calls(
+    mock_small_org: SmallOrg,
+) -> None:
+    initial = {"Results": 0, "Exceptions": 0}
+
+    @cove(reducer=count_outcomes, reducer_initial=initial)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    first = do_nothing()
+    second = do_nothing()
+
+    assert (
+        first
+        == second
+        == {"Results": len(mock_small_org.all_accounts), "Exceptions": 0}
+    )
+    assert initial == {"Results": 0, "Exceptions": 0}
+
+
+def test_reducer_must_be_callable(mock_small_org: SmallOrg) -> None:
+    @cove(reducer="sum")  # type: ignore[arg-type]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(TypeError, match="reducer must be callable"):
+        do_nothing()
+
+
+def test_reducer_cant_be_used_with_stream(mock_small_org: SmallOrg) -> None:
+    @cove(reducer=count_outcomes, stream=True)
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match="reducer and stream=True"):
+        do_nothing()
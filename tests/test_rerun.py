@@ -0,0 +1,121 @@
+import os
+import threading
+from typing import Any, Dict, List, Set, Tuple
+
+import pytest
+
+from botocove import CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+REGIONS = ["eu-west-1", "us-east-1"]
+
+
+class FlakyFunction(object):
+    """Fails in the given accounts and regions, recording where it ran."""
+
+    def __init__(self, failing: Set[Tuple[str, str]]) -> None:
+        self.failing = failing
+        self.calls: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, session: CoveSession) -> str:
+        info = session.session_information
+        key = (info["Id"], info["Region"] or "")
+        with self._lock:
+            self.calls.append(key)
+        if key in self.failing:
+            raise ValueError("a transient bug")
+        return key[0]
+
+
+def _output(
+    exceptions: List[Tuple[str, str]], failed_assume_role: List[Tuple[str, str]]
+) -> Dict[str, Any]:
+    return {
+        "Results": [],
+        "Exceptions": [{"Id": a, "Region": r} for a, r in exceptions],
+        "FailedAssumeRole": [{"Id": a, "Region": r} for a, r in failed_assume_role],
+    }
+
+
+def test_rerun_runs_only_the_failed_account_and_region(
+    mock_small_org: SmallOrg,
+) -> None:
+    failing = (mock_small_org.all_accounts[1], "us-east-1")
+    flaky = FlakyFunction({failing})
+    first = cove(flaky, regions=REGIONS)()
+    assert len(first["Exceptions"]) == 1
+
+    fixed = FlakyFunction(set())
+    second = cove(fixed, rerun=first)()
+
+    assert fixed.calls == [failing]
+    assert second["Exceptions"] == []
+    assert [(r["Id"], r["Region"]) for r in second["Results"]] == [failing]
+
+
+def test_rerun_from_a_journal(mock_small_org: SmallOrg, tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "journal.jsonl")
+    failing = {
+        (mock_small_org.all_accounts[0], "eu-west-1"),
+        (mock_small_org.all_accounts[2], "us-east-1"),
+    }
+    cove(FlakyFunction(failing), journal=path, regions=REGIONS)()
+
+    fixed = FlakyFunction(set())
+    output = cove(fixed, rerun=path)()
+
+    assert set(fixed.calls) == failing
+    assert len(output["Results"]) == 2
+
+
+@pytest.mark.parametrize(
+    "rerun_select,expected",
+    [
+        ("exceptions", [0]),
+        ("failed_assume_role", [1]),
+        ("failed", [0, 1]),
+    ],
+)
+def test_rerun_select_picks_the_categories_to_rerun(
+    mock_small_org: SmallOrg, rerun_select: str, expected: List[int]
+) -> None:
+    items = [
+        (mock_small_org.all_accounts[0], "eu-west-1"),
+        (mock_small_org.all_accounts[1], "us-east-1"),
+    ]
+    previous = _output(exceptions=[items[0]], failed_assume_role=[items[1]])
+    fixed = FlakyFunction(set())
+
+    cove(fixed, rerun=previous, rerun_select=rerun_select)()  # type: ignore[arg-type]
+
+    assert set(fixed.calls) == {items[i] for i in expected}
+
+
+def test_nothing_to_rerun_raises_value_error(mock_small_org: SmallOrg) -> None:
+    with pytest.raises(ValueError, match="There is nothing to rerun"):
+        cove(FlakyFunction(set()), rerun=_output([], []))()  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "kwargs,error,match",
+    [
+        ({"rerun_select": "some"}, ValueError, "rerun_select must be one of"),
+        ({"rerun": ["111111111111"]}, TypeError, "rerun must be a previous cove"),
+        (
+            {"rerun": "journal.jsonl", "target_ids": ["111111111111"]},
+            ValueError,
+            "target_ids can't be used with rerun",
+        ),
+        (
+            {"rerun": "journal.jsonl", "regions": ["eu-west-1"]},
+            ValueError,
+            "regions can't be used with rerun",
+        ),
+    ],
+)
+def test_invalid_rerun_arguments_raise(
+    mock_small_org: SmallOrg, kwargs: Dict[str, Any], error: type, match: str
+) -> None:
+    with pytest.raises(error, match=match):
+        cove(FlakyFunction(set()), **kwargs)()
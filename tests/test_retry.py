@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+import pytest
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError, EndpointConnectionError
+from pytest_mock import MockerFixture
+
+from botocove import CoveRetryPolicy, CoveSession, cove
+from botocove.cove_retry import is_transient_error
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def _client_error(code: str, status: int = 400) -> ClientError:
+    response: Dict[str, Any] = {
+        "Error": {"Code": code, "Message": code},
+        "ResponseMetadata": {"HTTPStatusCode": status},
+    }
+    return ClientError(response, "AnOperation")  # type: ignore[arg-type]
+
+
+def test_transient_function_failure_is_retried(mock_small_org: SmallOrg) -> None:
+    calls: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    @cove(retry=CoveRetryPolicy(base_delay=0))
+    def flaky(session: CoveSession) -> str:
+        account_id = session.session_information["Id"]
+        with lock:
+            calls[account_id] += 1
+            first_call = calls[account_id] == 1
+        if first_call:
+            raise _client_error("Throttling")
+        return account_id
+
+    output = flaky()
+
+    assert output["Exceptions"] == []
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+    assert all(r["Attempts"] == 2 for r in output["Results"])
+    assert set(calls.values()) == {2}
+
+
+def test_non_retryable_failure_is_not_retried(mock_small_org: SmallOrg) -> None:
+    calls: Counter[str] = Counter()
+
+    @cove(retry=CoveRetryPolicy(base_delay=0))
+    def broken(session: CoveSession) -> None:
+        calls[session.session_information["Id"]] += 1
+        raise ValueError("a bug")
+
+    output = broken()
+
+    assert len(output["Exceptions"]) == len(mock_small_org.all_accounts)
+    assert all(e["Attempts"] == 1 for e in output["Exceptions"])
+    assert set(calls.values()) == {1}
+
+
+def test_session_is_tried_at_most_max_attempts_times(
+    mock_small_org: SmallOrg,
+) -> None:
+    calls: Counter[str] = Counter()
+
+    @cove(
+        retry=CoveRetryPolicy(max_attempts=4, base_delay=0, retryable=lambda e: True),
+    )
+    def broken(session: CoveSession) -> None:
+        calls[session.session_information["Id"]] += 1
+        raise ValueError("a bug")
+
+    output = broken()
+
+    assert len(output["Exceptions"]) == len(mock_small_org.all_accounts)
+    assert all(e["Attempts"] == 4 for e in output["Exceptions"])
+    assert set(calls.values()) == {4}
+
+
+def test_transient_assume_role_failure_is_retried(
+    mock_small_org: SmallOrg, mocker: MockerFixture
+) -> None:
+    failing_account = mock_small_org.all_accounts[0]
+    make_api_call = BaseClient._make_api_call  # type: ignore[attr-defined]
+    failed: List[str] = []
+
+    def fail_once(
+        self: BaseClient, operation_name: str, api_params: Dict[str, Any]
+    ) -> Any:
+        if (
+            operation_name == "AssumeRole"
+            and failing_account in api_params["RoleArn"]
+            and not failed
+        ):
+            failed.append(api_params["RoleArn"])
+            raise _client_error("ServiceUnavailable", 503)
+        return make_api_call(self, operation_name, api_params)
+
+    mocker.patch.object(BaseClient, "_make_api_call", fail_once)
+
+    @cove(retry=CoveRetryPolicy(base_delay=0), regions=["eu-west-1", "us-east-1"])
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    output = account_id()
+
+    assert output["FailedAssumeRole"] == []
+    assert output["Exceptions"] == []
+    assert len(output["Results"]) == 2 * len(mock_small_org.all_accounts)
+    assert len(failed) == 1
+    retried = [r for r in output["Results"] if r["Attempts"] == 2]
+    assert {r["Id"] for r in retried} == {failing_account}
+
+
+def test_retry_succeeding_is_not_raised(mock_small_org: SmallOrg) -> None:
+    calls: Dict[str, int] = {}
+
+    @cove(retry=CoveRetryPolicy(base_delay=0), raise_exception=True)
+    def flaky(session: CoveSession) -> str:
+        account_id = session.session_information["Id"]
+        calls[account_id] = calls.get(account_id, 0) + 1
+        if calls[account_id] == 1:
+            raise EndpointConnectionError(endpoint_url="https://example.com")
+        return account_id
+
+    output = flaky()
+
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+
+
+def test_last_attempt_is_raised_with_raise_exception(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(
+        retry=CoveRetryPolicy(max_attempts=2, base_delay=0, retryable=lambda e: True),
+        raise_exception=True,
+    )
+    def broken(session: CoveSession) -> None:
+        raise ValueError("a bug")
+
+    with pytest.raises(ValueError, match="a bug"):
+        broken()
+
+
+def test_pending_retries_report_their_failure_at_the_deadline(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove(
+        retry=CoveRetryPolicy(base_delay=60, max_delay=60, retryable=lambda e: True),
+        deadline=5,
+    )
+    def broken(session: CoveSession) -> None:
+        raise ValueError("a bug")
+
+    # Full jitter may pick a short delay, so a few may have been retried. The
+    # deadline leaves every first attempt time to finish on a loaded machine.
+    started = time.monotonic()
+    output = broken()
+
+    assert time.monotonic() - started < 15
+    assert len(output["Exceptions"]) == len(mock_small_org.all_accounts)
+    assert all(
+        isinstance(e["ExceptionDetails"], ValueError) for e in output["Exceptions"]
+    )
+
+
+def test_records_have_no_attempts_without_a_retry_policy(
+    mock_small_org: SmallOrg,
+) -> None:
+    @cove()
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    output = do_nothing()
+
+    assert all("Attempts" not in r for r in output["Results"])
+
+
+def test_delay_is_capped_and_grows_with_attempts() -> None:
+    policy = CoveRetryPolicy(base_delay=1, max_delay=5)
+
+    assert all(0 <= policy.delay(1) <= 1 for _ in range(100))
+    assert all(0 <= policy.delay(3) <= 4 for _ in range(100))
+    assert all(0 <= policy.delay(20) <= 5 for _ in range(100))
+
+
+@pytest.mark.parametrize(
+    "error,transient",
+    [
+        (_client_error("Throttling"), True),
+        (_client_error("InternalError", 500), True),
+        (_client_error("SomethingNew", 503), True),
+        (_client_error("AccessDenied", 403), False),
+        (EndpointConnectionError(endpoint_url="https://example.com"), True),
+        (ValueError("a bug"), False),
+    ],
+)
+def test_default_retryable_errors(error: Exception, transient: bool) -> None:
+    assert is_transient_error(error) is transient
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_attempts": 0},
+        {"max_attempts": True},
+        {"base_delay": -1},
+        {"base_delay": 5, "max_delay": 1},
+    ],
+)
+def test_invalid_policy_raises_value_error(kwargs: Dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        CoveRetryPolicy(**kwargs)
+
+
+def test_invalid_retry_raises_type_error(mock_small_org: SmallOrg) -> None:
+    @cove(retry=3)  # type: ignore[arg-type]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(TypeError, match="retry must be a CoveRetryPolicy"):
+        do_nothing()
@@ -0,0 +1,56 @@
+from typing import List, Tuple
+
+import pytest
+
+from botocove import CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+REGIONS = ["eu-west-1", "us-east-1", "eu-central-1"]
+
+
+def account_and_region(session: CoveSession) -> Tuple[str, str]:
+    return session.session_information["Id"], session.region_name
+
+
+def test_account_scope_runs_once_per_account(mock_small_org: SmallOrg) -> None:
+    output = cove(account_and_region, regions=REGIONS, scope="account")()
+
+    assert len(output["Results"]) == len(mock_small_org.all_accounts)
+    assert {r["Id"] for r in output["Results"]} == set(mock_small_org.all_accounts)
+    assert all(r["Region"] == "eu-west-1" for r in output["Results"])
+    assert all(r["Result"][1] == "eu-west-1" for r in output["Results"])
+
+
+def test_region_scope_runs_in_every_region(mock_small_org: SmallOrg) -> None:
+    output = cove(account_and_region, regions=REGIONS)()
+
+    assert len(output["Results"]) == len(REGIONS) * len(mock_small_org.all_accounts)
+
+
+def test_account_scope_reruns_each_account_once(mock_small_org: SmallOrg) -> None:
+    failed: List[Tuple[str, str]] = [
+        (mock_small_org.all_accounts[0], "us-east-1"),
+        (mock_small_org.all_accounts[0], "eu-central-1"),
+        (mock_small_org.all_accounts[1], "eu-central-1"),
+    ]
+    previous = {
+        "Results": [],
+        "Exceptions": [{"Id": a, "Region": r} for a, r in failed],
+        "FailedAssumeRole": [],
+    }
+
+    output = cove(
+        account_and_region, rerun=previous, scope="account"  # type: ignore[arg-type]
+    )()
+
+    assert sorted((r["Id"], r["Region"]) for r in output["Results"]) == sorted(
+        [
+            (mock_small_org.all_accounts[0], "eu-central-1"),
+            (mock_small_org.all_accounts[1], "eu-central-1"),
+        ]
+    )
+
+
+def test_invalid_scope_raises_value_error(mock_small_org: SmallOrg) -> None:
+    with pytest.raises(ValueError, match="scope must be one of region, account"):
+        cove(account_and_region, scope="global")()
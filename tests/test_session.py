@@ -1,11 +1,15 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
 
 import pytest
 from boto3 import Session
+from botocore.loaders import Loader
 from mypy_boto3_organizations.type_defs import AccountTypeDef
 from mypy_boto3_sts.type_defs import PolicyDescriptorTypeTypeDef
+from pytest_mock import MockerFixture
 
 from botocove import CoveSession, cove
+from botocove.cove_session import BOTO3_DATA_PATH
 
 
 @pytest.fixture()
@@ -103,3 +107,96 @@ def test_session_result_formatter_with_policy_arn(
         }
     ]
     assert cove_output["Results"] == expected
+
+
+def test_boto_session_is_built_on_first_use(
+    org_accounts: List[AccountTypeDef],
+) -> None:
+    @cove
+    def is_session_built(session: CoveSession) -> Tuple[bool, bool]:
+        built_before_use = "_session" in vars(session)
+        session.client("sts")
+        return built_before_use, "_session" in vars(session)
+
+    cove_output = is_session_built()
+
+    assert cove_output["Exceptions"] == []
+    assert cove_output["Results"][0]["Result"] == (False, True)
+
+
+def test_sessions_share_a_loader(mock_session: Session) -> None:
+    org = mock_session.client("organizations")
+    org.create_organization(FeatureSet="ALL")
+    for i in range(3):
+        org.create_account(Email=f"{i}@address.com", AccountName=f"account-{i}")
+
+    @cove(regions=["eu-west-1", "us-east-1"])
+    def get_loader(session: CoveSession) -> Loader:
+        return session._loader
+
+    cove_output = get_loader()
+
+    assert cove_output["Exceptions"] == []
+    loaders = [result["Result"] for result in cove_output["Results"]]
+    assert len(loaders) == 6
+    assert all(loader is loaders[0] for loader in loaders)
+    assert loaders[0].search_paths.count(BOTO3_DATA_PATH) == 1
+
+
+def test_boto3_calls_setup_loader_override(
+    org_accounts: List[AccountTypeDef], mocker: MockerFixture
+) -> None:
+    spy = mocker.spy(CoveSession, "_setup_loader")
+
+    @cove
+    def create_client(session: CoveSession) -> None:
+        session.client("sts")
+
+    cove_output = create_client()
+
+    assert cove_output["Exceptions"] == []
+    assert spy.call_count == len(cove_output["Results"])
+
+
+def test_boto_session_is_built_once_across_threads(
+    org_accounts: List[AccountTypeDef], mocker: MockerFixture
+) -> None:
+    spy = mocker.spy(CoveSession, "initialize_boto_session")
+
+    @cove
+    def create_clients(session: CoveSession) -> bool:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: session.client("sts"), range(8)))
+        return all(client is clients[0] for client in clients)
+
+    cove_output = create_clients()
+
+    assert cove_output["Exceptions"] == []
+    assert cove_output["Results"][0]["Result"] is True
+    assert spy.call_count == 1
+
+
+def test_failed_boto_session_build_is_retried_on_next_use(
+    org_accounts: List[AccountTypeDef], mocker: MockerFixture
+) -> None:
+    initialize_boto_session = CoveSession.initialize_boto_session
+    attempts: List[int] = []
+
+    def fail_first_attempt(self: CoveSession, **kwargs: Any) -> None:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        initialize_boto_session(self, **kwargs)
+
+    mocker.patch.object(CoveSession, "initialize_boto_session", fail_first_attempt)
+
+    @cove
+    def use_session_twice(session: CoveSession) -> Optional[str]:
+        with pytest.raises(RuntimeError, match="boom"):
+            session.client("sts")
+        return session.region_name
+
+    cove_output = use_session_twice()
+
+    assert cove_output["Exceptions"] == []
+    assert cove_output["Results"][0]["Result"] == "eu-west-1"
@@ -0,0 +1,72 @@
+import threading
+from typing import Any, Dict, Generator, List
+
+import pytest
+
+from botocove import CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+def test_stream_yields_every_record(mock_small_org: SmallOrg) -> None:
+    @cove(stream=True)
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    records = list(account_id())
+
+    assert len(records) == len(mock_small_org.all_accounts)
+    assert all("ExceptionDetails" not in record for record in records)
+    assert all(record["Result"] == record["Id"] for record in records)
+
+
+def test_stream_yields_exceptions(mock_small_org: SmallOrg) -> None:
+    @cove(stream=True)
+    def raises(session: CoveSession) -> None:
+        raise ValueError("oops")
+
+    records = list(raises())
+
+    assert len(records) == len(mock_small_org.all_accounts)
+    assert all(isinstance(r["ExceptionDetails"], ValueError) for r in records)
+    assert all("Result" not in r for r in records)
+
+
+def test_stream_raises_when_raise_exception_is_set(mock_small_org: SmallOrg) -> None:
+    @cove(stream=True, raise_exception=True)
+    def raises(session: CoveSession) -> None:
+        raise ValueError("oops")
+
+    records = raises()
+
+    with pytest.raises(ValueError, match="oops"):
+        list(records)
+
+
+def test_stream_yields_before_the_run_finishes(mock_small_org: SmallOrg) -> None:
+    release = threading.Event()
+
+    @cove(stream=True, thread_workers=1)
+    def wait_after_first(session: CoveSession) -> str:
+        if release.is_set():
+            return "late"
+        release.set()
+        return "first"
+
+    records: Generator[Dict[str, Any], None, None] = wait_after_first()
+
+    assert next(records)["Result"] == "first"
+    records.close()
+
+
+def test_closing_stream_cancels_pending_sessions(mock_small_org: SmallOrg) -> None:
+    called: List[str] = []
+
+    @cove(stream=True, thread_workers=1)
+    def record_call(session: CoveSession) -> None:
+        called.append(session.session_information["Id"])
+
+    records = record_call()
+    next(records)
+    records.close()
+
+    assert len(called) < len(mock_small_org.all_accounts)
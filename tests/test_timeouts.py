@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+from typing import Iterator
+
+import pytest
+
+from botocove import CoveSession, cove
+from tests.moto_mock_org.moto_models import SmallOrg
+
+
+@pytest.fixture()
+def release() -> Iterator[threading.Event]:
+    """Lets the hung tasks a test abandons finish once it's done."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_task_past_its_timeout_is_recorded_as_an_exception(
+    mock_small_org: SmallOrg, release: threading.Event
+) -> None:
+    hung_id = mock_small_org.all_accounts[0]
+
+    @cove(task_timeout=2)
+    def hang_in_one_account(session: CoveSession) -> str:
+        if session.session_information["Id"] == hung_id:
+            release.wait()
+        return session.session_information["Id"]
+
+    started = time.monotonic()
+    output = hang_in_one_account()
+
+    assert time.monotonic() - started < 5
+    assert len(output["Results"]) == len(mock_small_org.all_accounts) - 1
+    assert hung_id not in {r["Id"] for r in output["Results"]}
+    assert len(output["Exceptions"]) == 1
+    timed_out = output["Exceptions"][0]
+    assert timed_out["Id"] == hung_id
+    assert isinstance(timed_out["ExceptionDetails"], TimeoutError)
+    assert "task_timeout" in str(timed_out["ExceptionDetails"])
+    assert "Result" not in timed_out
+
+
+def test_abandoned_task_finishing_later_leaves_the_record_unchanged(
+    mock_small_org: SmallOrg, release: threading.Event
+) -> None:
+    @cove(task_timeout=2, target_ids=mock_small_org.all_accounts[:1])
+    def hang(session: CoveSession) -> str:
+        release.wait()
+        return "late"
+
+    output = hang()
+    release.set()
+    time.sleep(0.1)
+
+    assert output["Results"] == []
+    assert isinstance(output["Exceptions"][0]["ExceptionDetails"], TimeoutError)
+    assert "Result" not in output["Exceptions"][0]
+
+
+def test_deadline_returns_partial_results_and_skips_queued_sessions(
+    mock_small_org: SmallOrg,
+    release: threading.Event,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    @cove(thread_workers=1, deadline=2)
+    def hang(session: CoveSession) -> None:
+        release.wait()
+
+    started = time.monotonic()
+    with caplog.at_level(logging.WARNING):
+        output = hang()
+
+    assert time.monotonic() - started < 5
+    assert output["Results"] == []
+    # Only the session running on the single worker is reported
+    assert len(output["Exceptions"]) == 1
+    assert isinstance(output["Exceptions"][0]["ExceptionDetails"], TimeoutError)
+    assert "deadline" in str(output["Exceptions"][0]["ExceptionDetails"])
+    skipped = len(mock_small_org.all_accounts) - 1
+    assert f"before {skipped} sessions started" in caplog.text
+
+
+def test_fast_run_is_unaffected_by_timeouts(mock_small_org: SmallOrg) -> None:
+    @cove(task_timeout=30, deadline=60, regions=["eu-west-1", "us-east-1"])
+    def account_id(session: CoveSession) -> str:
+        return session.session_information["Id"]
+
+    output = account_id()
+
+    assert output["Exceptions"] == []
+    assert len(output["Results"]) == 2 * len(mock_small_org.all_accounts)
+
+
+def test_timeout_is_raised_with_raise_exception(
+    mock_small_org: SmallOrg, release: threading.Event
+) -> None:
+    @cove(task_timeout=2, raise_exception=True)
+    def hang(session: CoveSession) -> None:
+        release.wait()
+
+    with pytest.raises(TimeoutError, match="task_timeout"):
+        hang()
+
+
+@pytest.mark.parametrize("name", ["task_timeout", "deadline"])
+@pytest.mark.parametrize("seconds", [0, -1, "5", True])
+def test_invalid_timeouts_raise_value_error(
+    mock_small_org: SmallOrg, name: str, seconds: object
+) -> None:
+    @cove(**{name: seconds})  # type: ignore[arg-type]
+    def do_nothing(session: CoveSession) -> None:
+        pass
+
+    with pytest.raises(ValueError, match=f"{name} must be a positive number"):
+        do_nothing()